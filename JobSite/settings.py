@@ -58,6 +58,7 @@ CRISPY_TEMPLATE_PACK = 'bootstrap4'  # or 'bootstrap5'
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -136,10 +137,28 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
-STATIC_URL = 'static/'
+# Optional CDN origin (e.g. https://d123.cloudfront.net) pulling from this app's /static/.
+# Hashed filenames from the manifest storage below make far-future caching safe.
+STATIC_HOST = os.getenv('DJANGO_STATIC_HOST', '')
+STATIC_URL = STATIC_HOST + '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static'] if (BASE_DIR / 'static').exists() else []
 
+# Static files are served by WhiteNoise (see MIDDLEWARE) with hashed, pre-compressed
+# copies written by `collectstatic`, so Django views never stream asset bytes.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+# Until `collectstatic` has written staticfiles.json (fresh checkouts, the test
+# runner), hash names on the fly instead of failing every page with a
+# "Missing staticfiles manifest entry" error
+WHITENOISE_MANIFEST_STRICT = False
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -149,3 +168,22 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # settings.py
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Internal Nginx location holding MEDIA_ROOT (e.g. /protected-media/, see
+# deploy/nginx.conf). When set, accounts.views.user_media checks access and
+# hands the file to Nginx with X-Accel-Redirect instead of streaming it.
+MEDIA_ACCEL_REDIRECT = os.getenv('DJANGO_MEDIA_ACCEL_REDIRECT', '')
+
+# Optional S3 bucket for user uploads (resumes, logos, profile pictures), so
+# media is served by S3/CloudFront instead of Django. Resumes are private:
+# URLs are pre-signed and expire, via CloudFront when a key pair is given.
+AWS_STORAGE_BUCKET_NAME = os.getenv('AWS_STORAGE_BUCKET_NAME', '')
+if AWS_STORAGE_BUCKET_NAME:
+    STORAGES['default'] = {'BACKEND': 'storages.backends.s3.S3Storage'}
+    AWS_S3_REGION_NAME = os.getenv('AWS_S3_REGION_NAME') or None
+    AWS_S3_CUSTOM_DOMAIN = os.getenv('AWS_S3_CUSTOM_DOMAIN') or None  # e.g. d123.cloudfront.net
+    AWS_DEFAULT_ACL = None
+    AWS_S3_FILE_OVERWRITE = False
+    AWS_QUERYSTRING_AUTH = True
+    AWS_QUERYSTRING_EXPIRE = int(os.getenv('AWS_QUERYSTRING_EXPIRE', '3600'))
+    AWS_CLOUDFRONT_KEY_ID = os.getenv('AWS_CLOUDFRONT_KEY_ID') or None
+    AWS_CLOUDFRONT_KEY = os.getenv('AWS_CLOUDFRONT_KEY', '').replace('\\n', '\n').encode() or None
@@ -18,17 +18,19 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from accounts.views import user_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('jobs.urls')),
     path('', include('accounts.urls')),
     path('bookmarks/', include('bookmarks.urls')),
+    # Resumes and profile pictures live under user_<id>/; resumes are private,
+    # so these go through a view even where the rest of MEDIA_ROOT is static
+    path(settings.MEDIA_URL.lstrip('/') + 'user_<int:user_id>/<path:filename>', user_media, name='user_media'),
 ]
 
-# This will ensure that media files are served in your local development environment
+# This will ensure that media files are served in your local development environment.
+# static() is a no-op outside DEBUG; static assets are served by WhiteNoise and
+# media by S3/CloudFront when AWS_STORAGE_BUCKET_NAME is set.
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-
-# Serve static files in development
-if settings.DEBUG:
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
@@ -14,3 +14,16 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'JobSite.settings')
 
 application = get_wsgi_application()
+
+# Import the URLconf and the view modules it pulls in now, in the server
+# process only, so the first request does not pay for building the (cached)
+# root resolver; under `gunicorn --preload` the workers inherit it
+from django.urls import get_resolver
+get_resolver().url_patterns
+
+# Opt-in, since every process importing this module would otherwise load the
+# NER model. Under `gunicorn --preload` this runs once in the master, so the
+# weights are loaded before the fork and shared copy-on-write by the workers.
+if os.environ.get('PRELOAD_AI_MODELS'):
+    from accounts.ai_enhanced import get_analyzer
+    get_analyzer().preload()
@@ -3,47 +3,74 @@ Gemini-only chatbot proxy. This module preserves the old import path
 `accounts.advanced_chatbot.advanced_chatbot` but delegates to Gemini.
 """
 
-from typing import Dict, List
+from functools import cache, lru_cache
+from types import MappingProxyType
+from typing import Dict, Generator, List, Optional, Tuple
+
+from .ml import split_skills
 
 try:
-    from .gemini_chatbot import gemini_chatbot
+    from .gemini_chatbot import get_gemini_chatbot
 except Exception:
-    gemini_chatbot = None
+    get_gemini_chatbot = None
+
+
+# Shared, read-only reply for when Gemini is unavailable
+_UNAVAILABLE = MappingProxyType({
+    'response': 'AI is not configured. Please set GEMINI_API_KEY.',
+    'confidence': 0.0,
+    'type': 'unavailable'
+})
 
 
 class AdvancedResumeChatbot:
     def generate_response(self, question: str, user_profile: Dict, conversation_history: List[Dict] = None) -> Dict:
-        if gemini_chatbot is None:
-            return {
-                'response': 'AI is not configured. Please set GEMINI_API_KEY.',
-                'confidence': 0.0,
-                'type': 'unavailable'
-            }
-        resp = gemini_chatbot.generate_response(question, user_profile, conversation_history)
-        if not resp or not resp.get('response'):
-            return {
-                'response': 'AI is not configured. Please set GEMINI_API_KEY.',
-                'confidence': 0.0,
-                'type': 'unavailable'
-            }
-        return resp
+        if get_gemini_chatbot is None:
+            return _UNAVAILABLE
+        resp = get_gemini_chatbot().generate_response(question, user_profile, conversation_history)
+        return resp if resp and resp.get('response') else _UNAVAILABLE
+
+    def stream_response(self, question: str, user_profile: Dict, conversation_history: List[Dict] = None) -> Generator[str, None, Dict]:
+        """Yield the answer in chunks, then return the response dict"""
+        if get_gemini_chatbot is not None:
+            resp = yield from get_gemini_chatbot().stream_response(question, user_profile, conversation_history)
+            if resp and resp.get('response'):
+                return resp
+        yield _UNAVAILABLE['response']
+        return _UNAVAILABLE
 
     def get_suggested_questions(self, user_profile: Dict) -> List[str]:
         skills = user_profile.get('skills') or ''
         if isinstance(skills, str):
-            skills_list = [s.strip() for s in skills.split(',') if s.strip()]
+            first_skill = next(iter(split_skills(skills)), None)
         else:
-            skills_list = skills or []
-        base = [
-            'What skills should I learn next?',
-            'How can I improve my resume?',
-            'What career paths match my skills?',
-            'How do I prepare for interviews?',
-            'What salary can I expect?',
-        ]
-        if skills_list:
-            base.insert(0, f'How do I level up from {skills_list[0]}?')
-        return base[:6]
-
-
-advanced_chatbot = AdvancedResumeChatbot()
+            first_skill = skills[0] if skills else None
+        return list(_suggest(first_skill))
+
+
+# Asked of every profile, after any skill-specific question
+_GENERAL_TAIL: Tuple[str, ...] = (
+    'What skills should I learn next?',
+    'How can I improve my resume?',
+    'What career paths match my skills?',
+    'How do I prepare for interviews?',
+    'What salary can I expect?',
+)
+
+
+@lru_cache(maxsize=1024)
+def _suggest(first_skill: Optional[str]) -> Tuple[str, ...]:
+    """Suggestions only depend on the profile's first skill, so share them"""
+    if first_skill is None:
+        return _GENERAL_TAIL
+    return ((f'How do I level up from {first_skill}?',) + _GENERAL_TAIL)[:6]
+
+
+@cache
+def get_chatbot() -> AdvancedResumeChatbot:
+    """Return the process-wide chatbot, built on first use"""
+    return AdvancedResumeChatbot()
+
+
+# Old import path; resolves to the same instance as get_chatbot()
+advanced_chatbot = get_chatbot()
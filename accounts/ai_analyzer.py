@@ -3,11 +3,22 @@ from typing import Dict, List, Optional
 from collections import Counter
 import math
 
+from .ml import trie_pattern
+
 try:
     import textstat
 except ImportError:
     textstat = None
 
+# Linear-time RE2 engine for scans over user-supplied text, when installed.
+# It has no lookaround, so the zero-width multi-pattern scans below stay on re.
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+    re2 = None
+
 # Import enhanced AI analyzer
 try:
     from .ai_enhanced import ai_analyzer
@@ -19,12 +30,26 @@ except ImportError:
 
 # --- Text Processing Utilities ---
 
+_KEEP_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789+.#/- ")
+# str.translate table over ASCII: allowed chars map to themselves, any other to
+# a space. Non-ASCII is replaced by _NON_ASCII_PATTERN first, so the table
+# stays fixed-size whatever text comes in.
+_NORMALIZE_TABLE = {i: i if chr(i) in _KEEP_CHARS else 32 for i in range(128)}
+_NON_ASCII_PATTERN = re.compile(r"[^\x00-\x7f]")
+
+
+_DISALLOWED_PATTERN = re.compile(r"[^a-z0-9+.#/\- ]")
+
+
 def normalize(s: str) -> str:
     """Lowercase, remove special chars, and normalize whitespace."""
+    # Already-normalized input (e.g. stored skill lists) is returned as is
+    if s[:1] != " " and s[-1:] != " " and "  " not in s and not _DISALLOWED_PATTERN.search(s):
+        return s
     s = s.lower()
-    s = re.sub(r"[^a-z0-9+.#/\- ]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    if not s.isascii():
+        s = _NON_ASCII_PATTERN.sub(" ", s)
+    return " ".join(s.translate(_NORMALIZE_TABLE).split())
 
 
 # --- Skill Extraction & Inference ---
@@ -62,6 +87,19 @@ def canonicalize_skill(tok: str) -> str:
     return SKILL_SYNONYMS.get(t, t)
 
 
+# Every one- or two-word form (skill or synonym) that canonicalizes to a known
+# skill, matched against normalized text padded with spaces. The lookahead
+# lets adjacent tokens share a separator. Forms are compiled as a trie, so
+# each position costs one character test per level instead of one attempt
+# per form; no single-word form is the first word of a two-word one.
+_SKILL_FORMS = {
+    form: canonicalize_skill(form)
+    for form in DEFAULT_SKILLS | SKILL_SYNONYMS.keys()
+    if canonicalize_skill(form) in DEFAULT_SKILLS
+}
+SKILL_FORM_PATTERN = re.compile(" (?=(%s) )" % trie_pattern(_SKILL_FORMS))
+
+
 def extract_skills(
         text: str, custom_list: Optional[List[str]] = None
 ) -> List[str]:
@@ -75,21 +113,12 @@ def extract_skills(
         except Exception as e:
             print(f"AI skill extraction failed, using fallback: {e}")
     
-    # Fallback to pattern-based extraction
+    # Fallback to pattern-based extraction: tokens and bigrams in one scan
     normalized_text = normalize(text)
-    toks = normalized_text.split()
-    found_skills = set()
-
-    for t in toks:
-        c = canonicalize_skill(t)
-        if c in DEFAULT_SKILLS:
-            found_skills.add(c)
-
-    bigrams = zip(toks, toks[1:])
-    for a, b in bigrams:
-        bigram = canonicalize_skill(f"{a} {b}")
-        if bigram in DEFAULT_SKILLS:
-            found_skills.add(bigram)
+    found_skills = {
+        _SKILL_FORMS[m.group(1)]
+        for m in SKILL_FORM_PATTERN.finditer(f" {normalized_text} ")
+    }
 
     if custom_list:
         for s in custom_list:
@@ -114,9 +143,11 @@ def infer_skills_from_text(resume_text: str) -> List[str]:
 
 # --- Resume Quality Analysis ---
 
-ACTION_VERBS = ["built", "developed", "designed", "led", "optimized", "implemented"]
-GENERIC_PHRASES = ["responsible for", "worked on", "team player", "duties included"]
-PASSIVE_HINT_PATTERN = re.compile(r"\b(?:was|were|is|are|been)\b\s+\w+ed\b", re.I)
+ACTION_VERBS = ("built", "developed", "designed", "led", "optimized", "implemented")
+GENERIC_PHRASES = ("responsible for", "worked on", "team player", "duties included")
+PASSIVE_HINT_PATTERN = (re2 if HAS_RE2 else re).compile(
+    r"(?i)\b(?:was|were|is|are|been)\b\s+\w+ed\b"
+)
 
 
 def resume_quality(resume_text: str) -> Dict[str, object]:
@@ -140,9 +171,11 @@ def resume_quality(resume_text: str) -> Dict[str, object]:
     
     # Fallback to pattern-based analysis
     suggestions = []
+    # Lowercase once; str's substring search beats a regex alternation here
+    lowered = resume_text.lower()
 
     for phrase in GENERIC_PHRASES:
-        if phrase in resume_text.lower():
+        if phrase in lowered:
             suggestions.append({
                 "message": "Avoid generic phrases. Use specific action verbs to describe your impact.",
                 "context": phrase
@@ -154,7 +187,7 @@ def resume_quality(resume_text: str) -> Dict[str, object]:
             "context": match.group(0)
         })
 
-    if not any(verb in resume_text.lower() for verb in ACTION_VERBS):
+    if not any(verb in lowered for verb in ACTION_VERBS):
         suggestions.append({
             "message": "Start bullet points with strong action verbs like 'developed', 'optimized', or 'led'.",
             "context": None
@@ -172,6 +205,16 @@ def resume_quality(resume_text: str) -> Dict[str, object]:
         "suggestions": suggestions,
     }
 
+# Contact details and quantified results. Each is searched separately so it
+# stops at the first hit; a combined scan has to visit every position.
+EMAIL_PATTERN = re.compile(r"[\w.-]+@[\w.-]+")
+PHONE_PATTERN = re.compile(r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}")
+METRIC_PATTERN = re.compile(r"\d+%|\$\d+|\d+\+")
+
+ATS_STANDARD_SECTIONS = ("education", "experience", "skills", "projects", "summary", "objective")
+# Achievement verbs counted by check_ats_friendliness
+ATS_ACTION_VERBS = ("achieved", "developed", "implemented", "managed", "created", "improved", "increased", "reduced")
+
 
 def check_ats_friendliness(text: str) -> Dict[str, object]:
     """
@@ -185,9 +228,11 @@ def check_ats_friendliness(text: str) -> Dict[str, object]:
         "recommendations": []
     }
 
+    lowered = text.lower()
+
     # Check for email and phone
-    email_match = re.search(r"[\w.-]+@[\w.-]+", text)
-    phone_match = re.search(r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", text)
+    email_match = "@" in text and EMAIL_PATTERN.search(text)
+    phone_match = PHONE_PATTERN.search(text)
     
     if email_match and phone_match:
         report["has_contact_info"] = True
@@ -199,8 +244,7 @@ def check_ats_friendliness(text: str) -> Dict[str, object]:
         report["warnings"].append("Missing contact information. Add email and phone number.")
 
     # Check for standard section headers
-    standard_sections = ["education", "experience", "skills", "projects", "summary", "objective"]
-    found_sections = [s for s in standard_sections if s in text.lower()]
+    found_sections = [s for s in ATS_STANDARD_SECTIONS if s in lowered]
     if len(found_sections) >= 3:
         report["uses_standard_sections"] = True
         report["score"] += 25
@@ -211,7 +255,9 @@ def check_ats_friendliness(text: str) -> Dict[str, object]:
         report["warnings"].append("Missing standard sections like 'Experience' or 'Skills'. Use simple text headers.")
 
     # Check for keywords density
-    word_count = len(text.split())
+    # Only the 200/600 thresholds matter, so stop splitting past 600 words:
+    # longer resumes come back as 601 pieces instead of a full word list
+    word_count = len(text.split(maxsplit=600))
     if word_count < 200:
         report["warnings"].append("Resume is too short. Aim for 200-400 words.")
     elif word_count > 600:
@@ -220,15 +266,14 @@ def check_ats_friendliness(text: str) -> Dict[str, object]:
         report["score"] += 15
 
     # Check for action verbs
-    action_verbs = ["achieved", "developed", "implemented", "managed", "created", "improved", "increased", "reduced"]
-    verb_count = sum(1 for verb in action_verbs if verb in text.lower())
+    verb_count = sum(1 for verb in ATS_ACTION_VERBS if verb in lowered)
     if verb_count >= 3:
         report["score"] += 15
     else:
         report["recommendations"].append("Use more action verbs to describe your achievements.")
 
     # Check for quantifiable results
-    if re.search(r'\d+%|\$\d+|\d+\+', text):
+    if METRIC_PATTERN.search(text):
         report["score"] += 10
     else:
         report["recommendations"].append("Include quantifiable results and metrics in your experience.")
@@ -240,7 +285,7 @@ def check_ats_friendliness(text: str) -> Dict[str, object]:
         report["score"] -= 10
 
     # Check for file format compatibility
-    if "pdf" in text.lower() or "doc" in text.lower():
+    if "pdf" in lowered or "doc" in lowered:
         report["recommendations"].append("Save your resume as a PDF for better ATS compatibility.")
 
     # Calculate final score
@@ -284,19 +329,24 @@ def calculate_skill_match_score(user_skills: List[str], job_requirements: str) -
     return min(100.0, max(0.0, score))
 
 
+# Common words ignored by extract_key_phrases
+KEY_PHRASE_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did',
+    'will', 'would', 'could', 'should',
+})
+KEY_PHRASE_WORD_PATTERN = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+
 def extract_key_phrases(text: str, max_phrases: int = 10) -> List[str]:
     """
     Extract key phrases from text using simple frequency analysis.
     """
-    # Remove common stop words
-    stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should'}
-    
-    # Extract words and phrases
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-    words = [w for w in words if w not in stop_words]
-    
-    # Count frequency
-    word_counts = Counter(words)
+    # Extract words and count them in C, then drop the stop words once each
+    # instead of filtering every token in Python
+    word_counts = Counter(KEY_PHRASE_WORD_PATTERN.findall(text.lower()))
+    for stop_word in KEY_PHRASE_STOP_WORDS:
+        word_counts.pop(stop_word, None)
     
     # Get most common phrases
     phrases = []
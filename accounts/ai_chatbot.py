@@ -1,6 +1,6 @@
 """
 AI Chatbot for JobVista - Resume-based Q&A System
-Uses Hugging Face transformers to create a personalized chatbot
+Answers questions from the user's profile with rule-based replies
 """
 
 import re
@@ -8,55 +8,100 @@ import json
 import logging
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from functools import cache, lru_cache
 
-# Handle optional AI imports gracefully
-try:
-    from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
-    import torch
-    HAS_TRANSFORMERS = True
-except ImportError:
-    HAS_TRANSFORMERS = False
-    print("Warning: Transformers not available. Install with: pip install transformers torch")
+from .ml import split_skills
 
 logger = logging.getLogger(__name__)
 
+# (intent, keywords) in routing priority order; keywords are substring-matched
+# against the lowercased question and the first intent with a hit wins
+INTENT_ROUTES = (
+    ('skills', ('skill', 'technology', 'tech')),
+    ('experience', ('experience', 'work', 'job', 'career')),
+    ('education', ('education', 'degree', 'university', 'college')),
+    ('salary', ('salary', 'pay', 'compensation', 'money')),
+    ('career_advice', ('position', 'role')),
+)
+
+
+def classify_question(question_lower: str) -> Optional[str]:
+    """Return the highest-priority intent mentioned in a lowercased question"""
+    for intent, keywords in INTENT_ROUTES:
+        for keyword in keywords:
+            if keyword in question_lower:
+                return intent
+    return None
+
+# Substring-matched against lowercased skills
+HIGH_DEMAND_SKILLS = ('python', 'javascript', 'react', 'aws', 'docker', 'kubernetes', 'machine learning', 'ai')
+
+# Whole words only: a bare 'hi' substring also hits "this", "which", "machine"
+GREETING_PATTERN = re.compile(r"\b(?:hello|hi|hey|greetings)\b")
+HELP_PATTERN = re.compile(r"\bhelp\b")
+
+# Fixed response text, assembled once per reply with str.format / "".join
+SALARY_HIGH_DEMAND_TEMPLATE = (
+    "Based on your skills in {top_skills}, you're likely in a high-demand field. "
+    "Salary expectations can vary based on location, experience, and company size. "
+    "I'd recommend researching current market rates for your specific skills and experience level."
+)
+SALARY_GENERAL_RESPONSE = (
+    "Salary expectations depend on many factors including your skills, experience, location, and the specific role. "
+    "I'd recommend researching current market rates for your field and experience level."
+)
+CAREER_ADVICE_NO_SKILLS = (
+    "To provide better career advice, I'd need to know more about your skills and experience. "
+    "Please complete your profile with your skills and work experience."
+)
+CAREER_ADVICE_INTRO = "Based on your skills in {top_skills}, here are some career suggestions: "
+CAREER_ADVICE_OUTRO = "Keep building your skills and consider getting certifications in your areas of interest."
+# (skill keywords, suggestion) in the order suggestions are listed
+CAREER_TRACKS = (
+    (('python',), "Consider roles in Data Science, Backend Development, or AI/ML. "),
+    (('javascript', 'react'), "Frontend Development or Full-Stack roles would be great fits. "),
+    (('aws', 'cloud'), "Cloud Engineering or DevOps roles are excellent options. "),
+)
+
+
+@lru_cache(maxsize=1024)
+def _parse_skills_csv(skills_csv: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    skills_list = split_skills(skills_csv)
+    return skills_list, tuple(skill.lower() for skill in skills_list)
+
+
+def parse_profile_skills(user_profile: Dict) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Return the profile's skills and their lowercased forms as parallel tuples"""
+    skills = user_profile.get('skills', '')
+    if isinstance(skills, str):
+        return _parse_skills_csv(skills)
+    skills_list = tuple(skills or ())
+    return skills_list, tuple(skill.lower() for skill in skills_list)
+
+
+@lru_cache(maxsize=1024)
+def _high_demand_flags(skills_lower: Tuple[str, ...]) -> Tuple[bool, ...]:
+    """Per skill, whether it mentions any HIGH_DEMAND_SKILLS keyword"""
+    return tuple(
+        any(hd_skill in skill_lower for hd_skill in HIGH_DEMAND_SKILLS)
+        for skill_lower in skills_lower
+    )
+
+
+@lru_cache(maxsize=1024)
+def _career_track_advice(skills_lower: Tuple[str, ...]) -> Tuple[str, ...]:
+    """CAREER_TRACKS suggestions whose keywords appear in any skill"""
+    # Newline-joined so a keyword can never span two skills
+    skills_text = '\n'.join(skills_lower)
+    return tuple(
+        advice for keywords, advice in CAREER_TRACKS
+        if any(keyword in skills_text for keyword in keywords)
+    )
+
+
 class ResumeChatbot:
     """AI Chatbot trained on user's resume and profile data"""
     
-    def __init__(self):
-        self.conversation_model = None
-        self.qa_model = None
-        self._initialize_models()
-    
-    def _initialize_models(self):
-        """Initialize AI models for conversation and Q&A"""
-        if not HAS_TRANSFORMERS:
-            logger.warning("Transformers not available, using fallback methods")
-            return
-        
-        try:
-            # Use a smaller, faster model for real-time chat
-            self.conversation_model = pipeline(
-                "text-generation",
-                model="microsoft/DialoGPT-small",
-                max_length=150,
-                do_sample=True,
-                temperature=0.7
-            )
-            
-            # Q&A model for resume-specific questions
-            self.qa_model = pipeline(
-                "question-answering",
-                model="distilbert-base-cased-distilled-squad"
-            )
-            
-            logger.info("AI Chatbot models initialized successfully")
-            
-        except Exception as e:
-            logger.error(f"Error initializing chatbot models: {e}")
-            self.conversation_model = None
-            self.qa_model = None
-    
     def create_resume_context(self, user_profile: Dict) -> str:
         """Create a comprehensive context from user's resume and profile"""
         context_parts = []
@@ -73,11 +118,7 @@ class ResumeChatbot:
         
         # Skills
         if user_profile.get('skills'):
-            skills = user_profile['skills']
-            if isinstance(skills, str):
-                skills_list = [skill.strip() for skill in skills.split(',') if skill.strip()]
-            else:
-                skills_list = skills
+            skills_list, _ = parse_profile_skills(user_profile)
             context_parts.append(f"Skills: {', '.join(skills_list)}")
         
         # Experience (if available)
@@ -97,29 +138,27 @@ class ResumeChatbot:
     def generate_response(self, question: str, user_profile: Dict, conversation_history: List[Dict] = None) -> Dict:
         """Generate AI response based on user's resume and question"""
         try:
-            # Create resume context
-            resume_context = self.create_resume_context(user_profile)
-            
             # Determine question type and generate appropriate response
             question_lower = question.lower()
+            intent = classify_question(question_lower)
             
-            if any(keyword in question_lower for keyword in ['skill', 'skills', 'technology', 'tech']):
-                return self._handle_skills_question(question, user_profile)
+            if intent == 'skills':
+                return self._handle_skills_question(question_lower, user_profile)
             
-            elif any(keyword in question_lower for keyword in ['experience', 'work', 'job', 'career']):
-                return self._handle_experience_question(question, user_profile)
+            elif intent == 'experience':
+                return self._handle_experience_question(question_lower, user_profile)
             
-            elif any(keyword in question_lower for keyword in ['education', 'degree', 'university', 'college']):
-                return self._handle_education_question(question, user_profile)
+            elif intent == 'education':
+                return self._handle_education_question(question_lower, user_profile)
             
-            elif any(keyword in question_lower for keyword in ['salary', 'pay', 'compensation', 'money']):
-                return self._handle_salary_question(question, user_profile)
+            elif intent == 'salary':
+                return self._handle_salary_question(question_lower, user_profile)
             
-            elif any(keyword in question_lower for keyword in ['job', 'position', 'role', 'career advice']):
-                return self._handle_career_advice_question(question, user_profile)
+            elif intent == 'career_advice':
+                return self._handle_career_advice_question(question_lower, user_profile)
             
             else:
-                return self._handle_general_question(question, user_profile, conversation_history)
+                return self._handle_general_question(question_lower, user_profile, conversation_history)
                 
         except Exception as e:
             logger.error(f"Error generating chatbot response: {e}")
@@ -129,13 +168,9 @@ class ResumeChatbot:
                 'type': 'error'
             }
     
-    def _handle_skills_question(self, question: str, user_profile: Dict) -> Dict:
+    def _handle_skills_question(self, question_lower: str, user_profile: Dict) -> Dict:
         """Handle questions about skills and technologies"""
-        skills = user_profile.get('skills', '')
-        if isinstance(skills, str):
-            skills_list = [skill.strip() for skill in skills.split(',') if skill.strip()]
-        else:
-            skills_list = skills
+        skills_list, skills_lower = parse_profile_skills(user_profile)
         
         if not skills_list:
             return {
@@ -145,18 +180,21 @@ class ResumeChatbot:
             }
         
         # Analyze question for specific skill mentions
-        question_lower = question.lower()
-        mentioned_skills = [skill for skill in skills_list if skill.lower() in question_lower]
+        mentioned_skills = [
+            skill for skill, skill_lower in zip(skills_list, skills_lower)
+            if skill_lower in question_lower
+        ]
         
         if mentioned_skills:
-            response = f"Based on your profile, you have experience with {', '.join(mentioned_skills)}. "
+            parts = [f"Based on your profile, you have experience with {', '.join(mentioned_skills)}. "]
             if len(mentioned_skills) == 1:
-                response += f"{mentioned_skills[0]} is a valuable skill in today's job market. "
-            response += f"Your other skills include {', '.join([s for s in skills_list if s not in mentioned_skills][:3])}."
+                parts.append(f"{mentioned_skills[0]} is a valuable skill in today's job market. ")
+            parts.append(f"Your other skills include {', '.join([s for s in skills_list if s not in mentioned_skills][:3])}.")
         else:
-            response = f"Your current skills include {', '.join(skills_list[:5])}. "
+            parts = [f"Your current skills include {', '.join(skills_list[:5])}. "]
             if len(skills_list) > 5:
-                response += f"You have {len(skills_list)} total skills listed in your profile."
+                parts.append(f"You have {len(skills_list)} total skills listed in your profile.")
+        response = ''.join(parts)
         
         return {
             'response': response,
@@ -165,7 +203,7 @@ class ResumeChatbot:
             'mentioned_skills': mentioned_skills
         }
     
-    def _handle_experience_question(self, question: str, user_profile: Dict) -> Dict:
+    def _handle_experience_question(self, question_lower: str, user_profile: Dict) -> Dict:
         """Handle questions about work experience"""
         experience = user_profile.get('experience', '')
         resume_text = user_profile.get('resume_text', '')
@@ -188,7 +226,7 @@ class ResumeChatbot:
             'type': 'experience'
         }
     
-    def _handle_education_question(self, question: str, user_profile: Dict) -> Dict:
+    def _handle_education_question(self, question_lower: str, user_profile: Dict) -> Dict:
         """Handle questions about education"""
         education = user_profile.get('education', '')
         
@@ -207,25 +245,20 @@ class ResumeChatbot:
             'type': 'education'
         }
     
-    def _handle_salary_question(self, question: str, user_profile: Dict) -> Dict:
+    def _handle_salary_question(self, question_lower: str, user_profile: Dict) -> Dict:
         """Handle questions about salary expectations"""
-        skills = user_profile.get('skills', '')
-        if isinstance(skills, str):
-            skills_list = [skill.strip() for skill in skills.split(',') if skill.strip()]
-        else:
-            skills_list = skills
+        skills_list, skills_lower = parse_profile_skills(user_profile)
         
         # Simple salary estimation based on skills
-        high_demand_skills = ['python', 'javascript', 'react', 'aws', 'docker', 'kubernetes', 'machine learning', 'ai']
-        user_high_demand_skills = [skill for skill in skills_list if any(hd_skill in skill.lower() for hd_skill in high_demand_skills)]
+        user_high_demand_skills = [
+            skill for skill, high_demand in zip(skills_list, _high_demand_flags(skills_lower))
+            if high_demand
+        ]
         
         if user_high_demand_skills:
-            response = f"Based on your skills in {', '.join(user_high_demand_skills[:3])}, you're likely in a high-demand field. "
-            response += "Salary expectations can vary based on location, experience, and company size. "
-            response += "I'd recommend researching current market rates for your specific skills and experience level."
+            response = SALARY_HIGH_DEMAND_TEMPLATE.format(top_skills=', '.join(user_high_demand_skills[:3]))
         else:
-            response = "Salary expectations depend on many factors including your skills, experience, location, and the specific role. "
-            response += "I'd recommend researching current market rates for your field and experience level."
+            response = SALARY_GENERAL_RESPONSE
         
         return {
             'response': response,
@@ -233,30 +266,21 @@ class ResumeChatbot:
             'type': 'salary'
         }
     
-    def _handle_career_advice_question(self, question: str, user_profile: Dict) -> Dict:
+    def _handle_career_advice_question(self, question_lower: str, user_profile: Dict) -> Dict:
         """Handle career advice questions"""
-        skills = user_profile.get('skills', '')
-        if isinstance(skills, str):
-            skills_list = [skill.strip() for skill in skills.split(',') if skill.strip()]
-        else:
-            skills_list = skills
+        skills_list, skills_lower = parse_profile_skills(user_profile)
         
         # Generate career advice based on skills
         if not skills_list:
-            response = "To provide better career advice, I'd need to know more about your skills and experience. "
-            response += "Please complete your profile with your skills and work experience."
+            response = CAREER_ADVICE_NO_SKILLS
         else:
-            response = f"Based on your skills in {', '.join(skills_list[:3])}, here are some career suggestions: "
+            parts = [CAREER_ADVICE_INTRO.format(top_skills=', '.join(skills_list[:3]))]
             
             # Skill-based career advice
-            if any('python' in skill.lower() for skill in skills_list):
-                response += "Consider roles in Data Science, Backend Development, or AI/ML. "
-            if any('javascript' in skill.lower() or 'react' in skill.lower() for skill in skills_list):
-                response += "Frontend Development or Full-Stack roles would be great fits. "
-            if any('aws' in skill.lower() or 'cloud' in skill.lower() for skill in skills_list):
-                response += "Cloud Engineering or DevOps roles are excellent options. "
+            parts.extend(_career_track_advice(skills_lower))
             
-            response += "Keep building your skills and consider getting certifications in your areas of interest."
+            parts.append(CAREER_ADVICE_OUTRO)
+            response = ''.join(parts)
         
         return {
             'response': response,
@@ -264,65 +288,61 @@ class ResumeChatbot:
             'type': 'career_advice'
         }
     
-    def _handle_general_question(self, question: str, user_profile: Dict, conversation_history: List[Dict] = None) -> Dict:
-        """Handle general questions using AI model"""
-        if not self.conversation_model:
-            return {
-                'response': "I'm here to help with questions about your profile, skills, and career. What would you like to know?",
-                'confidence': 0.5,
-                'type': 'general'
-            }
+    def _handle_general_question(self, question_lower: str, user_profile: Dict, conversation_history: List[Dict] = None) -> Dict:
+        """Handle general questions with rule-based replies"""
+        if GREETING_PATTERN.search(question_lower):
+            response = f"Hello! I'm your AI career assistant. I can help you with questions about your profile, skills, and career advice. What would you like to know?"
+        elif HELP_PATTERN.search(question_lower):
+            response = "I can help you with questions about your skills, experience, education, salary expectations, and career advice. Just ask me anything about your profile!"
+        else:
+            response = "I'm here to help with questions about your profile and career. You can ask me about your skills, experience, or career advice. What would you like to know?"
         
-        try:
-            # Create context for the conversation
-            context = self.create_resume_context(user_profile)
-            
-            # Simple response generation (fallback)
-            if 'hello' in question.lower() or 'hi' in question.lower():
-                response = f"Hello! I'm your AI career assistant. I can help you with questions about your profile, skills, and career advice. What would you like to know?"
-            elif 'help' in question.lower():
-                response = "I can help you with questions about your skills, experience, education, salary expectations, and career advice. Just ask me anything about your profile!"
-            else:
-                response = "I'm here to help with questions about your profile and career. You can ask me about your skills, experience, or career advice. What would you like to know?"
-            
-            return {
-                'response': response,
-                'confidence': 0.6,
-                'type': 'general'
-            }
-            
-        except Exception as e:
-            logger.error(f"Error in general question handling: {e}")
-            return {
-                'response': "I'm here to help with questions about your profile and career. What would you like to know?",
-                'confidence': 0.5,
-                'type': 'general'
-            }
+        return {
+            'response': response,
+            'confidence': 0.6,
+            'type': 'general'
+        }
     
     def get_suggested_questions(self, user_profile: Dict) -> List[str]:
         """Generate suggested questions based on user's profile"""
-        suggestions = []
-        
-        skills = user_profile.get('skills', '')
-        if skills:
-            suggestions.append("What are my strongest skills?")
-            suggestions.append("What career paths match my skills?")
-        
-        if user_profile.get('experience'):
-            suggestions.append("How can I improve my experience section?")
-        
-        if user_profile.get('education'):
-            suggestions.append("How does my education help my career?")
-        
-        # Always include these general suggestions
-        suggestions.extend([
-            "What salary can I expect?",
-            "What skills should I learn next?",
-            "How can I improve my resume?",
-            "What are the best job search strategies?"
-        ])
-        
-        return suggestions[:6]  # Return top 6 suggestions
+        return list(_suggest(
+            bool(user_profile.get('skills', '')),
+            bool(user_profile.get('experience')),
+            bool(user_profile.get('education')),
+        ))
+
+
+# Always included, after the profile-specific suggestions
+_GENERAL_TAIL: Tuple[str, ...] = (
+    "What salary can I expect?",
+    "What skills should I learn next?",
+    "How can I improve my resume?",
+    "What are the best job search strategies?",
+)
+
+
+@cache
+def _suggest(has_skills: bool, has_experience: bool, has_education: bool) -> Tuple[str, ...]:
+    """Suggestions only depend on which profile sections are filled in"""
+    head = ()
+    
+    if has_skills:
+        head += ("What are my strongest skills?", "What career paths match my skills?")
+    
+    if has_experience:
+        head += ("How can I improve my experience section?",)
+    
+    if has_education:
+        head += ("How does my education help my career?",)
+    
+    return (head + _GENERAL_TAIL)[:6]  # Return top 6 suggestions
+
+
+@cache
+def get_chatbot() -> ResumeChatbot:
+    """Return the process-wide chatbot, built on first use"""
+    return ResumeChatbot()
+
 
-# Global instance
-resume_chatbot = ResumeChatbot()
+# Old import path; resolves to the same instance as get_chatbot()
+resume_chatbot = get_chatbot()
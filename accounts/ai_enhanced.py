@@ -3,20 +3,21 @@ Enhanced AI Analysis System using Hugging Face Transformers
 Provides comprehensive resume analysis, skill extraction, and career recommendations
 """
 
+import os
 import re
 import json
 import logging
+import threading
+from functools import lru_cache
+from importlib.util import find_spec
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, date
 import numpy as np
 
-# Handle optional AI imports gracefully
-try:
-    from transformers import pipeline, AutoTokenizer, AutoModel
-    import torch
-    HAS_TRANSFORMERS = True
-except ImportError:
-    HAS_TRANSFORMERS = False
+# Handle optional AI imports gracefully. Importing transformers/torch takes
+# seconds, so only check they are installed; the models import them on first use.
+HAS_TRANSFORMERS = find_spec('transformers') is not None and find_spec('torch') is not None
+if not HAS_TRANSFORMERS:
     print("Warning: Transformers not available. Install with: pip install transformers torch")
 
 try:
@@ -27,17 +28,91 @@ except ImportError:
     HAS_SKLEARN = False
     print("Warning: Scikit-learn not available. Install with: pip install scikit-learn")
 
+from .ml import split_skills, trie_pattern
+
 logger = logging.getLogger(__name__)
 
+# Technical skills recognised by the pattern-based fallback
+SKILL_PATTERN_WORDS = (
+    'Python', 'Java', 'JavaScript', 'C++', 'C#', 'PHP', 'Ruby', 'Go', 'Swift', 'Kotlin',
+    'React', 'Angular', 'Vue', 'Node.js', 'Nodejs', 'Express', 'Django', 'Flask', 'Spring', 'Laravel',
+    'HTML', 'CSS', 'TypeScript', 'Bootstrap', 'Tailwind', 'Sass', 'Less',
+    'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'SQLite', 'Oracle', 'SQL Server',
+    'AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes', 'Jenkins', 'Git', 'GitHub',
+    'Machine Learning', 'AI', 'Data Science', 'Analytics', 'Statistics', 'R', 'Pandas', 'NumPy',
+    'Agile', 'Scrum', 'Kanban', 'Project Management', 'Leadership', 'Communication',
+)
+# One case-insensitive pass over the text; shared prefixes (Java/JavaScript,
+# Git/GitHub, ...) are factored into a trie so each position is tried once
+SKILL_PATTERN = re.compile(
+    r'\b(?:%s)\b' % trie_pattern({word.lower() for word in SKILL_PATTERN_WORDS}),
+    re.IGNORECASE,
+)
+
+
+# NER entities count as skills when they contain one of these keywords
+NER_SKILL_KEYWORDS = (
+    'python', 'javascript', 'java', 'react', 'angular', 'vue', 'node',
+    'django', 'flask', 'spring', 'express', 'mongodb', 'mysql', 'postgresql',
+    'aws', 'azure', 'docker', 'kubernetes', 'git', 'jenkins', 'ci/cd',
+    'machine learning', 'ai', 'data science', 'analytics', 'sql', 'nosql',
+    'html', 'css', 'bootstrap', 'tailwind', 'sass', 'less', 'webpack',
+    'agile', 'scrum', 'kanban', 'project management', 'leadership',
+    'communication', 'teamwork', 'problem solving', 'analytical thinking'
+)
+# Distinct SKILL_PATTERN hits at which extract_skills_from_text skips NER
+NER_SKIP_THRESHOLD = 5
+
+# Contact details scored by analyze_resume_quality; SOCIAL_PROFILE_PATTERN
+# runs on the case-folded text, so none of these need re.IGNORECASE
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
+SOCIAL_PROFILE_PATTERN = re.compile(r'\b(?:linkedin\.com|github\.com)\b')
+# 'technical skills' is covered by 'skills'
+SKILLS_SECTION_HEADERS = ('skills', 'core competencies')
+
+# Skills suggested in generate_career_advice when the user lacks them
+HIGH_DEMAND_SKILLS = (
+    'Python', 'JavaScript', 'React', 'AWS', 'Docker', 'Kubernetes',
+    'Machine Learning', 'Data Science', 'SQL', 'Git', 'Agile'
+)
+_HIGH_DEMAND_SKILLS_LOWER = tuple((skill, skill.lower()) for skill in HIGH_DEMAND_SKILLS)
+
+
+@lru_cache(maxsize=4096)
+def _skill_terms(text: str) -> Tuple[str, ...]:
+    """Lowercased SKILL_PATTERN matches; cached since job texts repeat across requests"""
+    return tuple(match.lower() for match in SKILL_PATTERN.findall(text))
+
+
+@lru_cache(maxsize=1024)
+def _custom_skill_pattern(skills_lower: Tuple[str, ...]):
+    """Case-insensitive whole-word matcher for skills SKILL_PATTERN doesn't know"""
+    # Lookarounds instead of \b so skills ending in symbols (C++, C#) still match
+    return re.compile(r'(?<!\w)(?:%s)(?!\w)' % trie_pattern(set(skills_lower)), re.IGNORECASE)
+
 class AIAnalyzer:
     """Enhanced AI analyzer using Hugging Face transformers"""
     
     def __init__(self):
-        self.skill_extractor = None
-        self.sentiment_analyzer = None
-        self.text_classifier = None
+        self._skill_extractor = None
         self.vectorizer = None
-        self._initialize_models()
+        self._models_loaded = False
+        self._models_lock = threading.Lock()
+    
+    @property
+    def skill_extractor(self):
+        """NER pipeline, loaded on first use once per process; None if unavailable"""
+        if not self._models_loaded:
+            with self._models_lock:
+                if not self._models_loaded:
+                    self._initialize_models()
+                    self._models_loaded = True
+        return self._skill_extractor
+    
+    def preload(self) -> bool:
+        """Load the models now instead of on first use; True if they are available"""
+        return self.skill_extractor is not None
     
     def _initialize_models(self):
         """Initialize AI models"""
@@ -46,69 +121,62 @@ class AIAnalyzer:
             return
         
         try:
+            from transformers import pipeline
+            
             # Skill extraction using NER
-            self.skill_extractor = pipeline(
+            self._skill_extractor = pipeline(
                 "ner",
                 model="dbmdz/bert-large-cased-finetuned-conll03-english",
                 aggregation_strategy="simple"
             )
             
-            # Sentiment analysis for career advice
-            self.sentiment_analyzer = pipeline(
-                "sentiment-analysis",
-                model="cardiffnlp/twitter-roberta-base-sentiment-latest"
-            )
-            
-            # Text classification for job categories
-            self.text_classifier = pipeline(
-                "text-classification",
-                model="microsoft/DialoGPT-medium"
-            )
-            
             logger.info("AI models initialized successfully")
             
         except Exception as e:
             logger.error(f"Error initializing AI models: {e}")
-            self.skill_extractor = None
-            self.sentiment_analyzer = None
-            self.text_classifier = None
+            self._skill_extractor = None
+            return
+        
+        # BERT-large in FP32 is over 1 GB; INT8 Linear weights are a quarter of
+        # that and faster on CPU. ANALYZER_QUANTIZE=0 keeps FP32.
+        if os.environ.get('ANALYZER_QUANTIZE', '1') != '0':
+            self._quantize_skill_extractor()
+    
+    def _quantize_skill_extractor(self):
+        """Swap the NER model's Linear layers for dynamically quantized INT8 ones"""
+        try:
+            import torch
+            self._skill_extractor.model = torch.ao.quantization.quantize_dynamic(
+                self._skill_extractor.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        except Exception as e:
+            logger.warning(f"INT8 quantization unavailable, keeping FP32 NER model: {e}")
     
     def extract_skills_from_text(self, text: str) -> List[str]:
         """Extract skills from resume text using AI"""
         if not text or not text.strip():
             return []
         
-        skills = []
+        # Pattern-based extraction is cheap, so run it first
+        skills = self._extract_skills_patterns(text)
         
-        # Use AI model if available
-        if self.skill_extractor and HAS_TRANSFORMERS:
+        # The NER pass only pays off when the patterns found little; on a
+        # resume that already lists several known skills it is skipped
+        if len({skill.lower() for skill in skills}) < NER_SKIP_THRESHOLD and self.skill_extractor and HAS_TRANSFORMERS:
             try:
                 # Extract entities from text
                 entities = self.skill_extractor(text[:512])  # Limit text length
                 
                 # Filter for skill-related entities
-                skill_keywords = [
-                    'python', 'javascript', 'java', 'react', 'angular', 'vue', 'node',
-                    'django', 'flask', 'spring', 'express', 'mongodb', 'mysql', 'postgresql',
-                    'aws', 'azure', 'docker', 'kubernetes', 'git', 'jenkins', 'ci/cd',
-                    'machine learning', 'ai', 'data science', 'analytics', 'sql', 'nosql',
-                    'html', 'css', 'bootstrap', 'tailwind', 'sass', 'less', 'webpack',
-                    'agile', 'scrum', 'kanban', 'project management', 'leadership',
-                    'communication', 'teamwork', 'problem solving', 'analytical thinking'
-                ]
-                
                 for entity in entities:
                     if entity['score'] > 0.7:  # High confidence
                         entity_text = entity['word'].lower()
-                        if any(keyword in entity_text for keyword in skill_keywords):
+                        if any(keyword in entity_text for keyword in NER_SKILL_KEYWORDS):
                             skills.append(entity['word'])
                             
             except Exception as e:
                 logger.error(f"Error in AI skill extraction: {e}")
         
-        # Fallback: Pattern-based skill extraction
-        skills.extend(self._extract_skills_patterns(text))
-        
         # Remove duplicates and clean
         skills = list(set([skill.strip().title() for skill in skills if skill.strip()]))
         
@@ -116,24 +184,7 @@ class AIAnalyzer:
     
     def _extract_skills_patterns(self, text: str) -> List[str]:
         """Fallback pattern-based skill extraction"""
-        skills = []
-        
-        # Common technical skills patterns
-        skill_patterns = [
-            r'\b(?:Python|Java|JavaScript|Java|C\+\+|C#|PHP|Ruby|Go|Swift|Kotlin)\b',
-            r'\b(?:React|Angular|Vue|Node\.?js|Express|Django|Flask|Spring|Laravel)\b',
-            r'\b(?:HTML|CSS|JavaScript|TypeScript|Bootstrap|Tailwind|Sass|Less)\b',
-            r'\b(?:MySQL|PostgreSQL|MongoDB|Redis|SQLite|Oracle|SQL Server)\b',
-            r'\b(?:AWS|Azure|Google Cloud|Docker|Kubernetes|Jenkins|Git|GitHub)\b',
-            r'\b(?:Machine Learning|AI|Data Science|Analytics|Statistics|R|Pandas|NumPy)\b',
-            r'\b(?:Agile|Scrum|Kanban|Project Management|Leadership|Communication)\b'
-        ]
-        
-        for pattern in skill_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            skills.extend(matches)
-        
-        return skills
+        return SKILL_PATTERN.findall(text)
     
     def analyze_resume_quality(self, text: str) -> Dict:
         """Analyze resume quality and provide suggestions"""
@@ -152,8 +203,11 @@ class AIAnalyzer:
         score = 0
         max_score = 100
         
+        lowered = text.casefold()
+        
         # Length check (10-20% of score)
-        word_count = len(text.split())
+        # Only the 200/800 thresholds matter, so stop splitting past 800 words
+        word_count = len(text.split(maxsplit=800))
         if 200 <= word_count <= 800:
             score += 15
             analysis['strengths'].append("Good resume length")
@@ -165,13 +219,11 @@ class AIAnalyzer:
             analysis['areas_for_improvement'].append("Resume might be too long. Consider condensing.")
         
         # Contact information check (10% of score)
-        contact_patterns = [
-            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # Email
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # Phone
-            r'\b(?:linkedin\.com|github\.com)\b'  # Social profiles
-        ]
-        
-        contact_score = sum(1 for pattern in contact_patterns if re.search(pattern, text, re.IGNORECASE))
+        contact_score = (
+            bool(EMAIL_PATTERN.search(text))
+            + bool(PHONE_PATTERN.search(text))
+            + bool(SOCIAL_PROFILE_PATTERN.search(lowered))
+        )
         score += contact_score * 3
         if contact_score == 3:
             analysis['strengths'].append("Complete contact information")
@@ -179,8 +231,7 @@ class AIAnalyzer:
             analysis['areas_for_improvement'].append("Add missing contact information")
         
         # Skills section check (20% of score)
-        skills_section = re.search(r'(?:skills|technical skills|core competencies)', text, re.IGNORECASE)
-        if skills_section:
+        if any(header in lowered for header in SKILLS_SECTION_HEADERS):
             score += 20
             analysis['strengths'].append("Skills section present")
         else:
@@ -188,7 +239,7 @@ class AIAnalyzer:
         
         # Experience section check (25% of score)
         experience_keywords = ['experience', 'worked', 'developed', 'managed', 'led', 'created', 'implemented']
-        experience_count = sum(1 for keyword in experience_keywords if keyword.lower() in text.lower())
+        experience_count = sum(1 for keyword in experience_keywords if keyword in lowered)
         if experience_count >= 3:
             score += 25
             analysis['strengths'].append("Strong experience descriptions")
@@ -200,7 +251,7 @@ class AIAnalyzer:
         
         # Education section check (10% of score)
         education_keywords = ['education', 'degree', 'university', 'college', 'bachelor', 'master', 'phd']
-        if any(keyword in text.lower() for keyword in education_keywords):
+        if any(keyword in lowered for keyword in education_keywords):
             score += 10
             analysis['strengths'].append("Education section present")
         else:
@@ -208,7 +259,7 @@ class AIAnalyzer:
         
         # ATS-friendly check (20% of score)
         ats_keywords = ['achieved', 'increased', 'improved', 'developed', 'managed', 'led', 'created']
-        ats_count = sum(1 for keyword in ats_keywords if keyword.lower() in text.lower())
+        ats_count = sum(1 for keyword in ats_keywords if keyword in lowered)
         if ats_count >= 5:
             score += 20
             analysis['strengths'].append("ATS-friendly language used")
@@ -240,14 +291,12 @@ class AIAnalyzer:
         }
         
         # Analyze skill gaps
-        high_demand_skills = [
-            'Python', 'JavaScript', 'React', 'AWS', 'Docker', 'Kubernetes',
-            'Machine Learning', 'Data Science', 'SQL', 'Git', 'Agile'
-        ]
-        
         user_skills_lower = [skill.lower() for skill in skills]
-        missing_skills = [skill for skill in high_demand_skills 
-                         if not any(skill.lower() in user_skill for user_skill in user_skills_lower)]
+        # Newline-joined so one substring test per skill checks every user
+        # skill, and a match can never span two of them
+        user_skills_text = '\n'.join(user_skills_lower)
+        missing_skills = [skill for skill, skill_lower in _HIGH_DEMAND_SKILLS_LOWER
+                         if skill_lower not in user_skills_text]
         
         if missing_skills:
             advice['skill_gaps'] = missing_skills[:5]  # Top 5 missing skills
@@ -282,6 +331,9 @@ class AIAnalyzer:
         if not job_listings:
             return []
         
+        if HAS_SKLEARN:
+            return self._recommend_jobs_tfidf(user_skills, job_listings, user_preferences)
+        
         recommendations = []
         
         for job in job_listings:
@@ -317,6 +369,73 @@ class AIAnalyzer:
         
         return recommendations[:10]  # Top 10 recommendations
     
+    def _recommend_jobs_tfidf(self, user_skills: List[str], job_listings: List[Dict], user_preferences: Dict = None) -> List[Dict]:
+        """Score all jobs with one TF-IDF cosine similarity over pattern-matched skill terms"""
+        job_texts = [job.get('description', '') + ' ' + job.get('requirements', '') for job in job_listings]
+        job_terms = [_skill_terms(text) for text in job_texts]
+        
+        # Each user skill counts through its SKILL_PATTERN terms plus its own
+        # name, so skills the pattern doesn't know (Rust, Terraform, ...) are
+        # still in the vocabulary and matched as whole words in each posting
+        per_skill_terms = []
+        custom_skills = set()
+        for skill in user_skills:
+            terms = _skill_terms(skill)
+            skill_lower = skill.strip().lower()
+            if skill_lower and skill_lower not in terms:
+                terms += (skill_lower,)
+                custom_skills.add(skill_lower)
+            per_skill_terms.append(terms)
+        user_terms = tuple(term for terms in per_skill_terms for term in terms)
+        
+        if custom_skills:
+            custom_skills = tuple(sorted(custom_skills))
+            pattern = _custom_skill_pattern(custom_skills)
+            job_terms = [
+                terms + tuple(match.lower() for match in pattern.findall(text))
+                for terms, text in zip(job_terms, job_texts)
+            ]
+        
+        if user_terms:
+            # Documents are already term tuples, so the analyzer passes them through
+            vectorizer = TfidfVectorizer(analyzer=lambda terms: terms)
+            matrix = vectorizer.fit_transform([user_terms] + job_terms)
+            skill_scores = cosine_similarity(matrix[0:1], matrix[1:]).ravel()
+        else:
+            skill_scores = np.zeros(len(job_listings))
+        
+        # Location and salary preferences scale the score, as in the loop version
+        multipliers = np.ones(len(job_listings))
+        if user_preferences and 'location' in user_preferences:
+            location = user_preferences['location'].lower()
+            multipliers *= np.fromiter(
+                (1.2 if location in job.get('location', '').lower() else 1.0 for job in job_listings),
+                dtype=float, count=len(job_listings),
+            )
+        if user_preferences and 'min_salary' in user_preferences:
+            min_salary = user_preferences['min_salary']
+            multipliers *= np.fromiter(
+                (1.1 if job.get('salary_min', 0) >= min_salary else 1.0 for job in job_listings),
+                dtype=float, count=len(job_listings),
+            )
+        
+        match_scores = np.minimum(skill_scores * multipliers, 1.0)
+        top = np.argsort(-match_scores, kind='stable')[:10]  # Top 10 recommendations
+        job_term_sets = {i: set(job_terms[i]) for i in top}
+        
+        return [
+            {
+                'job': job_listings[i],
+                'match_score': float(match_scores[i]),
+                'skill_match': float(skill_scores[i]),
+                'matched_skills': [
+                    skill for skill, terms in zip(user_skills, per_skill_terms)
+                    if not job_term_sets[i].isdisjoint(terms)
+                ]
+            }
+            for i in top
+        ]
+    
     def _extract_job_skills(self, job_text: str) -> List[str]:
         """Extract skills from job description"""
         return self.extract_skills_from_text(job_text)
@@ -378,7 +497,7 @@ class AIAnalyzer:
         # Skills-based insights
         skills = profile_data.get('skills', [])
         if isinstance(skills, str):
-            skills = [skill.strip() for skill in skills.split(',') if skill.strip()]
+            skills = split_skills(skills)
         
         if len(skills) >= 10:
             insights['strengths'].append("Diverse skill set")
@@ -392,5 +511,19 @@ class AIAnalyzer:
         
         return insights
 
-# Global instance
-ai_analyzer = AIAnalyzer()
+_analyzer: Optional[AIAnalyzer] = None
+_analyzer_lock = threading.Lock()
+
+
+def get_analyzer() -> AIAnalyzer:
+    """Return the process-wide analyzer, built on first use"""
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = AIAnalyzer()
+    return _analyzer
+
+
+# Old import path; resolves to the same instance as get_analyzer()
+ai_analyzer = get_analyzer()
@@ -6,4 +6,4 @@ class AccountsConfig(AppConfig):
     name = 'accounts'
 
     def ready(self):
-        from . import signals  # noqa
\ No newline at end of file
+        from . import signals  # noqa
@@ -1,7 +1,14 @@
+import re
+
 from django import forms
 from django.contrib.auth.models import User
+from django.db.models import Count, Q
+from .ml import split_skills
 from .models import UserProfile
 
+# Digits, optionally separated by '+', '-' or spaces
+PHONE_PATTERN = re.compile(r'[+\- ]*\d[\d+\- ]*')
+
 
 class UserProfileForm(forms.ModelForm):
     class Meta:
@@ -56,7 +63,7 @@ class UserProfileForm(forms.ModelForm):
 
     def clean_phone(self):
         phone = self.cleaned_data.get('phone')
-        if phone and not phone.replace('+', '').replace('-', '').replace(' ', '').isdigit():
+        if phone and not PHONE_PATTERN.fullmatch(phone):
             raise forms.ValidationError('Please enter a valid phone number.')
         return phone
 
@@ -64,8 +71,7 @@ class UserProfileForm(forms.ModelForm):
         skills = self.cleaned_data.get('skills')
         if skills:
             # Clean up the skills string
-            skills_list = [skill.strip() for skill in skills.split(',') if skill.strip()]
-            return ', '.join(skills_list)
+            return ', '.join(split_skills(skills))
         return skills
 
 
@@ -84,22 +90,33 @@ class SignupForm(forms.Form):
     password1 = forms.CharField(widget=forms.PasswordInput, min_length=8)
     password2 = forms.CharField(widget=forms.PasswordInput)
 
-    def clean_username(self):
-        username = self.cleaned_data['username']
-        if User.objects.filter(username=username).exists():
-            raise forms.ValidationError('Username already exists.')
-        return username
-
-    def clean_email(self):
-        email = self.cleaned_data['email']
-        if User.objects.filter(email=email).exists():
-            raise forms.ValidationError('Email already exists.')
-        return email
-
     def clean(self):
         cleaned = super().clean()
+        self._check_unique_account(cleaned.get('username'), cleaned.get('email'))
         pwd1 = cleaned.get('password1')
         pwd2 = cleaned.get('password2')
         if pwd1 and pwd2 and pwd1 != pwd2:
             self.add_error('password2', 'Passwords do not match.')
-        return cleaned
\ No newline at end of file
+        return cleaned
+
+    def _check_unique_account(self, username, email):
+        """Check username and email against existing users in a single query"""
+        lookups = {}
+        if username:
+            lookups['username'] = Q(username=username)
+        if email:
+            lookups['email'] = Q(email=email)
+        if not lookups:
+            return
+
+        any_match = Q()
+        for lookup in lookups.values():
+            any_match |= lookup
+        # Per field, how many of the matching users already hold that value
+        taken = User.objects.filter(any_match).aggregate(
+            **{field: Count('pk', filter=lookup) for field, lookup in lookups.items()}
+        )
+        if taken.get('username'):
+            self.add_error('username', 'Username already exists.')
+        if taken.get('email'):
+            self.add_error('email', 'Email already exists.')
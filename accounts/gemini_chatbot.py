@@ -1,19 +1,27 @@
 import os
+import hashlib
 import logging
-from typing import Dict, List
+import threading
+from importlib.util import find_spec
+from typing import Dict, Generator, List, Optional
 try:
     from django.conf import settings
+    from django.core.cache import cache
 except Exception:
     settings = None
+    cache = None
 
 logger = logging.getLogger(__name__)
 
+# Identical prompts (same profile, history and question) reuse the last answer
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+# Importing the SDK (grpc, protobuf) is slow, so only check it is installed;
+# _ensure_client imports it when the chatbot is first built
 try:
-    import google.generativeai as genai
-    HAS_GEMINI = True
-except Exception:
+    HAS_GEMINI = find_spec('google.generativeai') is not None
+except ImportError:
     HAS_GEMINI = False
-    genai = None
 
 
 class GeminiChatbot:
@@ -29,7 +37,9 @@ class GeminiChatbot:
         # Prefer user's target model; allow override via env
         self.model_name = os.environ.get('GEMINI_MODEL', 'gemini-2.0-flash')
         self._client_ready = False
-        self._model = None
+        # SDK model objects aren't documented as thread-safe, so each thread
+        # of a threaded worker gets its own (see _thread_model)
+        self._local = threading.local()
         self._ensure_client()
 
     def _ensure_client(self):
@@ -38,6 +48,7 @@ class GeminiChatbot:
             self._client_ready = False
             return
         try:
+            import google.generativeai as genai
             genai.configure(api_key=self.api_key)
             # Try preferred model; on 404, fallback to known supported ones
             candidates = [
@@ -51,7 +62,7 @@ class GeminiChatbot:
             last_err = None
             for name in candidates:
                 try:
-                    self._model = genai.GenerativeModel(name)
+                    self._local.model = genai.GenerativeModel(name)
                     self.model_name = name
                     self._client_ready = True
                     return
@@ -87,85 +98,162 @@ class GeminiChatbot:
         parts.append("Ground answers in this profile whenever relevant.")
         return " \n".join(parts)
 
-    def generate_response(self, question: str, user_profile: Dict, conversation_history: List[Dict] = None) -> Dict:
+    def _ensure_ready(self) -> bool:
         # If not ready, try to (re)load API key and initialize now (supports env set after import)
         if not self._client_ready:
-            # Re-read from settings/env in case it was set after startup
-            try:
-                from django.conf import settings as dj_settings
-            except Exception:
-                dj_settings = None
-            self.api_key = (
-                (getattr(dj_settings, 'GEMINI_API_KEY', None) if dj_settings else None)
-                or os.environ.get('GEMINI_API_KEY')
-                or os.environ.get('GOOGLE_API_KEY')
-                or self.api_key
-            )
-            self._ensure_client()
-            if not self._client_ready:
-                return {
-                    'response': None,
-                    'confidence': 0.0,
-                    'type': 'unavailable'
-                }
+            # Threads share this instance, so only one of them re-initializes
+            with _gemini_chatbot_lock:
+                if not self._client_ready:
+                    # Re-read from settings/env in case it was set after startup
+                    try:
+                        from django.conf import settings as dj_settings
+                    except Exception:
+                        dj_settings = None
+                    self.api_key = (
+                        (getattr(dj_settings, 'GEMINI_API_KEY', None) if dj_settings else None)
+                        or os.environ.get('GEMINI_API_KEY')
+                        or os.environ.get('GOOGLE_API_KEY')
+                        or self.api_key
+                    )
+                    self._ensure_client()
+        return self._client_ready
+
+    def _thread_model(self):
+        """This thread's GenerativeModel for the resolved model name"""
+        model = getattr(self._local, 'model', None)
+        if model is None:
+            import google.generativeai as genai
+            model = self._local.model = genai.GenerativeModel(self.model_name)
+        return model
+
+    def _build_prompt(self, question: str, user_profile: Dict, conversation_history: List[Dict] = None) -> str:
+        system = self._build_system_preamble(user_profile)
+        # Simpler prompt composition to reduce SDK formatting issues, with few-shot coaching
+        history_text = ""
+        if conversation_history:
+            turns = []
+            for turn in conversation_history[-8:]:
+                q = turn.get('question', '').strip()
+                a = turn.get('response', '').strip()
+                if q:
+                    turns.append(f"User: {q}")
+                if a:
+                    turns.append(f"Assistant: {a}")
+            history_text = "\n".join(turns)
+
+        # Detect short greetings and steer a better response
+        normalized = (question or '').strip().lower()
+        is_greeting = normalized in {"hi", "hello", "hey", "yo", "hola", "hi!", "hello!", "hey!"}
+
+        few_shot = (
+            "Assistant guidelines:\n"
+            "- Avoid repeating generic capabilities on greetings.\n"
+            "- Ask one targeted question informed by the user's skills.\n"
+            "- Prefer concrete steps, examples, or brief plans.\n"
+            "Example:\n"
+            "User: hi\n"
+            "Assistant: Hi! Want to focus on resume tweaks, interview prep, or next skills to learn for React/Django?\n"
+        )
+
+        prompt_parts = [system]
+        if few_shot:
+            prompt_parts.append(few_shot)
+        if history_text:
+            prompt_parts.append(history_text)
+        # Add an intent hint for greetings to avoid generic answers
+        if is_greeting:
+            prompt_parts.append("Assistant: Keep greeting to one short line, then ask one specific follow-up.")
+        prompt_parts.append(f"User: {question}")
+        prompt_parts.append("Assistant:")
+        return "\n\n".join(filter(None, prompt_parts))
+
+    def _cache_key(self, prompt: str) -> str:
+        return 'gemini:response:' + hashlib.sha256(f"{self.model_name}\n{prompt}".encode()).hexdigest()
+
+    @staticmethod
+    def _result(text: str) -> Dict:
+        # Basic confidence heuristic
+        conf = 0.7 + min(0.25, len(text) / 8000)
+        return {'response': text, 'confidence': min(conf, 0.95), 'type': 'gemini'}
+
+    def generate_response(self, question: str, user_profile: Dict, conversation_history: List[Dict] = None) -> Dict:
+        if not self._ensure_ready():
+            return {
+                'response': None,
+                'confidence': 0.0,
+                'type': 'unavailable'
+            }
 
         try:
-            system = self._build_system_preamble(user_profile)
-            # Simpler prompt composition to reduce SDK formatting issues, with few-shot coaching
-            history_text = ""
-            if conversation_history:
-                turns = []
-                for turn in conversation_history[-8:]:
-                    q = turn.get('question', '').strip()
-                    a = turn.get('response', '').strip()
-                    if q:
-                        turns.append(f"User: {q}")
-                    if a:
-                        turns.append(f"Assistant: {a}")
-                history_text = "\n".join(turns)
-
-            # Detect short greetings and steer a better response
-            normalized = (question or '').strip().lower()
-            is_greeting = normalized in {"hi", "hello", "hey", "yo", "hola", "hi!", "hello!", "hey!"}
-
-            few_shot = (
-                "Assistant guidelines:\n"
-                "- Avoid repeating generic capabilities on greetings.\n"
-                "- Ask one targeted question informed by the user's skills.\n"
-                "- Prefer concrete steps, examples, or brief plans.\n"
-                "Example:\n"
-                "User: hi\n"
-                "Assistant: Hi! Want to focus on resume tweaks, interview prep, or next skills to learn for React/Django?\n"
-            )
-
-            prompt_parts = [system]
-            if few_shot:
-                prompt_parts.append(few_shot)
-            if history_text:
-                prompt_parts.append(history_text)
-            # Add an intent hint for greetings to avoid generic answers
-            if is_greeting:
-                prompt_parts.append("Assistant: Keep greeting to one short line, then ask one specific follow-up.")
-            prompt_parts.append(f"User: {question}")
-            prompt_parts.append("Assistant:")
-            prompt = "\n\n".join(filter(None, prompt_parts))
+            prompt = self._build_prompt(question, user_profile, conversation_history)
+            cache_key = self._cache_key(prompt)
+            if cache is not None:
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    return cached
 
             # Use structured contents format to avoid SDK type issues
             contents = [{"role": "user", "parts": [prompt]}]
-            resp = self._model.generate_content(contents)
+            resp = self._thread_model().generate_content(contents)
             text = (resp.text or '').strip()
             if not text:
                 return {'response': None, 'confidence': 0.0, 'type': 'empty'}
-            # Basic confidence heuristic
-            conf = 0.7 + min(0.25, len(text) / 8000)
-            return {'response': text, 'confidence': min(conf, 0.95), 'type': 'gemini'}
+            result = self._result(text)
+            if cache is not None:
+                cache.set(cache_key, result, RESPONSE_CACHE_TIMEOUT)
+            return result
         except Exception as e:
             msg = f"Gemini response error: {e} (model={self.model_name})"
             logger.error(msg)
             return {'response': msg, 'confidence': 0.0, 'type': 'error'}
 
+    def stream_response(self, question: str, user_profile: Dict, conversation_history: List[Dict] = None) -> Generator[str, None, Optional[Dict]]:
+        """Yield the answer in chunks as Gemini produces them, then return the
+        same dict generate_response would, or None if nothing was produced."""
+        if not self._ensure_ready():
+            return None
+
+        chunks = []
+        try:
+            prompt = self._build_prompt(question, user_profile, conversation_history)
+            cache_key = self._cache_key(prompt)
+            if cache is not None:
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    yield cached['response']
+                    return cached
+
+            contents = [{"role": "user", "parts": [prompt]}]
+            for chunk in self._thread_model().generate_content(contents, stream=True):
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    yield chunk.text
+            text = ''.join(chunks).strip()
+            if not text:
+                return None
+            result = self._result(text)
+            if cache is not None:
+                cache.set(cache_key, result, RESPONSE_CACHE_TIMEOUT)
+            return result
+        except Exception as e:
+            logger.error(f"Gemini streaming error: {e} (model={self.model_name})")
+            # Keep whatever was already sent to the client
+            text = ''.join(chunks).strip()
+            return self._result(text) if text else None
+
+
+_gemini_chatbot = None
+_gemini_chatbot_lock = threading.Lock()
+
 
-# Global instance
-gemini_chatbot = GeminiChatbot()
+def get_gemini_chatbot() -> GeminiChatbot:
+    """Return the process-wide Gemini chatbot, built on first use rather than
+    at import so management commands and worker boot skip the SDK setup"""
+    global _gemini_chatbot
+    if _gemini_chatbot is None:
+        with _gemini_chatbot_lock:
+            if _gemini_chatbot is None:
+                _gemini_chatbot = GeminiChatbot()
+    return _gemini_chatbot
 
 
@@ -1,8 +1,9 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from accounts.ml import split_skills
 from accounts.models import UserProfile, Notification
 from jobs.models import Job
-from django.db.models import Q
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 
@@ -15,10 +16,21 @@ class Command(BaseCommand):
         users_with_skills = User.objects.filter(
             userprofile__skills__isnull=False,
             userprofile__skills__gt=''
-        ).select_related('userprofile')
+        ).select_related('userprofile').only('id', 'username', 'userprofile__skills')
+
+        # Jobs posted in the last 24 hours, fetched once and matched in memory
+        # rather than re-queried per user
+        yesterday = timezone.now() - timedelta(days=1)
+        new_jobs = [
+            (title.lower(), description.lower(), requirements.lower())
+            for title, description, requirements in Job.objects.filter(
+                created_at__gte=yesterday,
+                is_active=True
+            ).values_list('title', 'description', 'requirements')
+        ]
 
         new_jobs_count = 0
-        alerts_sent = 0
+        notifications = []
 
         for user in users_with_skills:
             try:
@@ -27,48 +39,38 @@ class Command(BaseCommand):
                     continue
 
                 # Get user's skills
-                user_skills = [skill.strip().lower() for skill in profile.skills.split(',') if skill.strip()]
-                
+                user_skills = [skill.lower() for skill in split_skills(profile.skills)]
+
                 if not user_skills:
                     continue
 
-                # Find jobs posted in the last 24 hours that match user skills
-                yesterday = timezone.now() - timedelta(days=1)
-                matching_jobs = Job.objects.filter(
-                    created_at__gte=yesterday,
-                    is_active=True
-                ).filter(
-                    Q(description__icontains=user_skills[0]) |
-                    Q(requirements__icontains=user_skills[0]) |
-                    Q(title__icontains=user_skills[0])
+                # A job matches when each of the first 3 skills appears in its
+                # title, description or requirements
+                job_count = sum(
+                    1 for fields in new_jobs
+                    if all(any(skill in field for field in fields) for skill in user_skills[:3])
                 )
 
-                # Add more skill matches
-                for skill in user_skills[1:3]:  # Check first 3 skills
-                    matching_jobs = matching_jobs.filter(
-                        Q(description__icontains=skill) |
-                        Q(requirements__icontains=skill) |
-                        Q(title__icontains=skill)
-                    )
-
-                if matching_jobs.exists():
-                    job_count = matching_jobs.count()
+                if job_count:
                     new_jobs_count += job_count
-                    
+
                     # Create notification
-                    Notification.objects.create(
+                    notifications.append(Notification(
                         user=user,
                         title=f"🎯 {job_count} New Job{'s' if job_count > 1 else ''} Match Your Skills!",
                         message=f"We found {job_count} new job{'s' if job_count > 1 else ''} that match your skills: {', '.join(user_skills[:3])}",
                         link="/"
-                    )
-                    alerts_sent += 1
+                    ))
 
             except Exception as e:
                 self.stdout.write(
                     self.style.ERROR(f'Error processing user {user.username}: {str(e)}')
                 )
 
+        with transaction.atomic():
+            Notification.objects.bulk_create(notifications, batch_size=500)
+        alerts_sent = len(notifications)
+
         self.stdout.write(
             self.style.SUCCESS(
                 f'Successfully sent {alerts_sent} job alerts for {new_jobs_count} new jobs'
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-16 07:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0017_notification_accounts_no_user_id_b29cd4_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at'], name='accounts_no_user_id_b37b35_idx'),
+        ),
+    ]
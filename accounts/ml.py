@@ -1,6 +1,8 @@
 import re
+import string
 from collections import Counter
-from difflib import get_close_matches
+from difflib import SequenceMatcher
+from functools import lru_cache
 from typing import List, Tuple, Dict
 
 # Handle optional imports gracefully
@@ -28,11 +30,17 @@ CANONICAL_SKILLS = [
 
 
 TOKEN_RE = re.compile(r"[a-zA-Z0-9+#.]+")
+# TOKEN_RE for already-lowercased text
+_LOWER_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
 
 
 def tokenize(text: str) -> List[str]:
     if not text:
         return []
+    # Lowercasing ASCII text up front can't create or merge tokens (non-ASCII
+    # letters like the Kelvin sign lower to ASCII ones), so do it in one call
+    if text.isascii():
+        return _LOWER_TOKEN_RE.findall(text.lower())
     return [t.lower() for t in TOKEN_RE.findall(text)]
 
 
@@ -43,9 +51,9 @@ def bag_of_words(tokens: List[str]) -> Counter:
 def cosine_similarity(a: Counter, b: Counter) -> float:
     if not a or not b:
         return 0.0
-    # dot product
-    common = set(a.keys()) & set(b.keys())
-    dot = sum(a[t] * b[t] for t in common)
+    # dot product: walk the smaller vector and probe the larger one
+    small, large = (a, b) if len(a) <= len(b) else (b, a)
+    dot = sum(v * large[t] for t, v in small.items() if t in large)
     # norms
     na = sum(v*v for v in a.values()) ** 0.5
     nb = sum(v*v for v in b.values()) ** 0.5
@@ -54,26 +62,87 @@ def cosine_similarity(a: Counter, b: Counter) -> float:
     return dot / (na * nb)
 
 
+# Only single-token skills can match a token; multi-word ones never do
+_SINGLE_TOKEN_SKILLS = tuple(s for s in CANONICAL_SKILLS if ' ' not in s)
+
+# (token, threshold) -> skills within the fuzzy threshold of that token. The
+# same words recur across resumes, so most tokens are only compared once.
+_CLOSE_SKILLS_CACHE: Dict[Tuple[str, float], Tuple[str, ...]] = {}
+_CLOSE_SKILLS_CACHE_MAX = 16384
+
+
+def _match_new_tokens(tokens: List[str], threshold: float) -> Dict[str, List[str]]:
+    """Fuzzy-match tokens against the single-token skills, as get_close_matches does."""
+    close = {token: [] for token in tokens}
+    matcher = SequenceMatcher()
+    for skill in _SINGLE_TOKEN_SKILLS:
+        matcher.set_seq2(skill)
+        skill_len = len(skill)
+        for token in tokens:
+            # real_quick_ratio's length bound, checked without touching the matcher
+            token_len = len(token)
+            if 2.0 * min(token_len, skill_len) / (token_len + skill_len) < threshold:
+                continue
+            matcher.set_seq1(token)
+            if matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold:
+                close[token].append(skill)
+    return close
+
+
 def extract_skills_from_text(text: str, threshold: float = 0.84) -> List[str]:
     """Match tokens to a canonical skills list using fuzzy matching."""
-    tokens = set(tokenize(text))
     found = set()
-    for skill in CANONICAL_SKILLS:
-        base = skill.lower()
-        if base in tokens:
-            found.add(skill)
+    pending = []
+    for token in set(tokenize(text)):
+        cached = _CLOSE_SKILLS_CACHE.get((token, threshold))
+        if cached is None:
+            pending.append(token)
         else:
-            # fuzzy match single-token skills only
-            if ' ' not in base:
-                match = get_close_matches(base, tokens, n=1, cutoff=threshold)
-                if match:
-                    found.add(skill)
+            found.update(cached)
+    if pending:
+        if len(_CLOSE_SKILLS_CACHE) > _CLOSE_SKILLS_CACHE_MAX:
+            _CLOSE_SKILLS_CACHE.clear()
+        for token, skills in _match_new_tokens(pending, threshold).items():
+            _CLOSE_SKILLS_CACHE[(token, threshold)] = tuple(skills)
+            found.update(skills)
     return sorted(found)
 
 
+@lru_cache(maxsize=4096)
+def split_skills(skills_csv: str) -> Tuple[str, ...]:
+    """Split a comma-separated skills field into stripped, non-empty names."""
+    return tuple(s for s in (part.strip() for part in skills_csv.split(',')) if s)
+
+
+@lru_cache(maxsize=4096)
+def split_skills_lower(skills_csv: str) -> Tuple[str, ...]:
+    """split_skills, lowercased."""
+    return tuple(s.lower() for s in split_skills(skills_csv))
+
+
+def trie_pattern(words) -> str:
+    """Regex alternation for words with shared prefixes factored into a trie."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:%s)" % "|".join(branches)
+        # A word may end here: try the longer continuations first
+        return "(?:%s)?" % body if "" in node else body
+
+    return emit(trie)
+
+
 def compute_resume_keywords(skills_csv: str, extra_text: str = '') -> Tuple[List[str], Counter]:
     """Return (skills, vector) for a resume/profile."""
-    skills = [s.strip() for s in (skills_csv or '').split(',') if s.strip()]
+    skills = list(split_skills(skills_csv or ''))
     if extra_text:
         inferred = extract_skills_from_text(extra_text)
         for s in inferred:
@@ -83,11 +152,15 @@ def compute_resume_keywords(skills_csv: str, extra_text: str = '') -> Tuple[List
     return skills, bag_of_words(tokens)
 
 
-def score_job_match(resume_vec: Counter, job_text: str) -> int:
-    job_vec = bag_of_words(tokenize(job_text))
-    sim = cosine_similarity(resume_vec, job_vec)
-    # Map similarity to 0-100 with a gentle curve
-    score = int(max(0, min(100, round(sim * 140))))
-    return score
+# Keras TextVectorization's default standardization strips ASCII punctuation
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
 
 
+def score_text_match(resume_text: str, job_text: str) -> int:
+    """Cosine similarity of the two texts' lowercased, punctuation-stripped
+    word counts, mapped to 0-100."""
+    resume_vec = Counter((resume_text or '').lower().translate(_PUNCTUATION_TABLE).split())
+    job_vec = Counter((job_text or '').lower().translate(_PUNCTUATION_TABLE).split())
+    sim = cosine_similarity(resume_vec, job_vec)
+    # Map similarity to 0-100 with a gentle curve
+    return int(max(0, min(100, round(sim * 140))))
@@ -2,7 +2,7 @@ from django.db import models
 from django.contrib.auth.models import User
 from jobs.models import Company
 from django.utils import timezone
-from .ml import compute_resume_keywords
+from .ml import compute_resume_keywords, split_skills, split_skills_lower
 
 
 class CustomUser(models.Model):
@@ -40,6 +40,16 @@ class UserProfile(models.Model):
     def __str__(self):
         return f"{self.user.username}'s profile"
 
+    @property
+    def skills_list(self):
+        """Skill names from the comma-separated field; parsed once per distinct value"""
+        return split_skills(self.skills or '')
+
+    @property
+    def skills_lower(self):
+        """skills_list, lowercased"""
+        return split_skills_lower(self.skills or '')
+
     class Meta:
         get_latest_by = 'created_at'
 
@@ -93,6 +103,14 @@ class Notification(models.Model):
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # The first serves the unread-notifications query made on every page
+        # render, the second the full newest-first lists and their counts
+        indexes = [
+            models.Index(fields=['user', 'is_read', '-created_at']),
+            models.Index(fields=['user', '-created_at']),
+        ]
+
     def __str__(self):
         return f"Notification<{self.user.username}: {self.title}>"
 
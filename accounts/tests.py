@@ -1,3 +1,239 @@
-from django.test import TestCase
+import json
+import shutil
+import tempfile
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from jobs.models import ApplyForJob, Company, Job, JobCategory
+from .ai_enhanced import HAS_SKLEARN, AIAnalyzer
+from .forms import SignupForm
+from .models import CustomUser, UserProfile
+
+
+class SignupFormTests(TestCase):
+    def setUp(self):
+        User.objects.create_user('taken', 'taken@example.com', 'pass12345')
+
+    def form(self, **overrides):
+        data = {
+            'first_name': 'Ada',
+            'last_name': 'Lovelace',
+            'username': 'ada',
+            'email': 'ada@example.com',
+            'role': 'applicant',
+            'dob': '1990-01-01',
+            'password1': 'pass12345',
+            'password2': 'pass12345',
+        }
+        data.update(overrides)
+        return SignupForm(data)
+
+    def test_new_account_is_valid(self):
+        self.assertTrue(self.form().is_valid())
+
+    def test_taken_username_and_email_checked_in_one_query(self):
+        form = self.form(username='taken', email='taken@example.com')
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['username'], ['Username already exists.'])
+        self.assertEqual(form.errors['email'], ['Email already exists.'])
+
+    def test_only_the_taken_field_is_flagged(self):
+        form = self.form(email='taken@example.com')
+        self.assertFalse(form.is_valid())
+        self.assertNotIn('username', form.errors)
+        self.assertIn('email', form.errors)
+
+
+class LoginViewTests(TestCase):
+    def setUp(self):
+        applicant = User.objects.create_user('applicant', password='pass12345')
+        CustomUser.objects.create(user=applicant, role='applicant')
+        employer = User.objects.create_user('employer', password='pass12345')
+        CustomUser.objects.create(user=employer, role='company')
+
+    def login(self, username, password='pass12345'):
+        return self.client.post(reverse('login'), {'username': username, 'password': password})
+
+    def test_applicant_goes_to_dashboard(self):
+        self.assertRedirects(self.login('applicant'), reverse('dashboard'), fetch_redirect_response=False)
+
+    def test_company_user_without_company_completes_profile(self):
+        self.assertRedirects(self.login('employer'), reverse('profile_completion'), fetch_redirect_response=False)
+
+    def test_company_user_with_company_goes_to_company_dashboard(self):
+        company = Company.objects.create(name='Acme', description='Widgets', location='Remote')
+        CustomUser.objects.filter(user__username='employer').update(company=company)
+        self.assertRedirects(self.login('employer'), reverse('company_dashboard'), fetch_redirect_response=False)
+
+    def test_unknown_username(self):
+        response = self.login('nobody')
+        self.assertRedirects(response, reverse('login'), fetch_redirect_response=False)
+        self.assertEqual([str(m) for m in get_messages(response.wsgi_request)], ['Username does not exist'])
+
+    def test_wrong_password(self):
+        response = self.login('applicant', 'wrong-password')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([str(m) for m in get_messages(response.wsgi_request)], ['Invalid username or password'])
+
+
+class FakeGeminiChatbot:
+    """Streams a fixed answer the way GeminiChatbot.stream_response does"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def stream_response(self, question, user_profile, conversation_history=None):
+        yield from self.chunks
+        if not self.chunks:
+            return None
+        return {'response': ''.join(self.chunks), 'confidence': 0.8, 'type': 'gemini'}
+
+
+class ChatbotStreamApiTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('seeker', password='pass12345')
+        UserProfile.objects.create(user=user, skills='Python, Django')
+        self.client.force_login(user)
+
+    def stream(self, chunks, question='What should I learn next?'):
+        with mock.patch('accounts.advanced_chatbot.get_gemini_chatbot', return_value=FakeGeminiChatbot(chunks)):
+            response = self.client.post(
+                reverse('chatbot_stream_api'), json.dumps({'question': question}), content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+            body = b''.join(response.streaming_content).decode()
+        return [json.loads(event[len('data: '):]) for event in body.split('\n\n') if event]
+
+    def test_streams_deltas_then_done_event(self):
+        events = self.stream(['Learn ', 'Rust.'])
+        self.assertEqual(events[:2], [{'delta': 'Learn '}, {'delta': 'Rust.'}])
+        self.assertTrue(events[2]['done'])
+        self.assertEqual(events[2]['response'], 'Learn Rust.')
+        self.assertEqual(events[2]['type'], 'gemini')
+
+    def test_turn_is_saved_to_session_history(self):
+        self.stream(['Learn ', 'Rust.'])
+        history = self.client.session['chatbot_history']
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history[0]['question'], 'What should I learn next?')
+        self.assertEqual(history[0]['response'], 'Learn Rust.')
+
+    def test_unavailable_fallback_when_nothing_streams(self):
+        events = self.stream([])
+        self.assertEqual(events[-1]['type'], 'unavailable')
+        self.assertEqual(events[0]['delta'], events[-1]['response'])
+
+    def test_rejects_bad_requests(self):
+        url = reverse('chatbot_stream_api')
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.assertEqual(self.client.post(url, '{bad', content_type='application/json').status_code, 400)
+        self.assertEqual(
+            self.client.post(url, json.dumps({'question': '  '}), content_type='application/json').status_code, 400
+        )
+
+
+class UserMediaTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media_settings = override_settings(MEDIA_ROOT=media_root, MEDIA_ACCEL_REDIRECT='')
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        self.seeker = User.objects.create_user('seeker', password='pass12345')
+        self.profile = UserProfile.objects.create(
+            user=self.seeker,
+            resume=SimpleUploadedFile('cv.pdf', b'%PDF resume'),
+            profile_picture=SimpleUploadedFile('me.png', b'png bytes'),
+        )
+        self.company = Company.objects.create(name='Acme', description='Widgets', location='Remote')
+        self.employer = User.objects.create_user('employer', password='pass12345')
+        CustomUser.objects.create(user=self.employer, role='company', company=self.company)
+
+    def get(self, field):
+        return self.client.get(getattr(self.profile, field).url)
+
+    def test_owner_gets_private_resume(self):
+        self.client.force_login(self.seeker)
+        response = self.get('resume')
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF resume')
+        self.assertEqual(response['Cache-Control'], 'private, no-store')
+
+    def test_resume_hidden_from_anonymous_and_unrelated_companies(self):
+        self.assertEqual(self.get('resume').status_code, 404)
+        self.client.force_login(self.employer)
+        self.assertEqual(self.get('resume').status_code, 404)
+
+    def test_company_sees_resume_of_an_applicant(self):
+        category = JobCategory.objects.create(name='Engineering', slug='engineering')
+        job = Job.objects.create(
+            title='Developer', slug='developer', company=self.company, category=category,
+            description='Build', requirements='Python', responsibilities='Ship',
+            employment_type='full_time', experience_level='mid', location='Remote',
+        )
+        ApplyForJob.objects.create(user=self.seeker, job=job)
+        self.client.force_login(self.employer)
+        self.assertEqual(self.get('resume').status_code, 200)
+
+    def test_profile_picture_is_public(self):
+        self.assertEqual(self.get('profile_picture').status_code, 200)
+
+    def test_unknown_files_are_not_served(self):
+        self.client.force_login(self.seeker)
+        self.assertEqual(self.client.get(f'/media/user_{self.seeker.pk}/other.pdf').status_code, 404)
+
+    def test_nginx_sends_the_file_when_accel_redirect_is_configured(self):
+        self.client.force_login(self.seeker)
+        with self.settings(MEDIA_ACCEL_REDIRECT='/protected-media/'):
+            response = self.get('resume')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/' + self.profile.resume.name)
+
+
+@skipUnless(HAS_SKLEARN, 'scikit-learn is not installed')
+class RecommendJobsTfidfTests(SimpleTestCase):
+    def recommend(self, skills, jobs, preferences=None):
+        listings = [{'title': title, 'description': text, 'requirements': ''} for title, text in jobs]
+        return {
+            rec['job']['title']: rec
+            for rec in AIAnalyzer().recommend_jobs(skills, listings, preferences)
+        }
+
+    def test_unknown_skill_matches_as_whole_word(self):
+        recs = self.recommend(['Rust'], [('systems', 'We write Rust services'), ('trust', 'A trustworthy team')])
+        self.assertGreater(recs['systems']['match_score'], 0)
+        self.assertEqual(recs['systems']['matched_skills'], ['Rust'])
+        self.assertEqual(recs['trust']['match_score'], 0)
+        self.assertEqual(recs['trust']['matched_skills'], [])
+
+    def test_symbol_skills_match(self):
+        recs = self.recommend(['C++', 'C#'], [('native', 'Modern C++ engines'), ('dotnet', 'C# and .NET'), ('c', 'Plain C code')])
+        self.assertEqual(recs['native']['matched_skills'], ['C++'])
+        self.assertEqual(recs['dotnet']['matched_skills'], ['C#'])
+        self.assertEqual(recs['c']['match_score'], 0)
+
+    def test_location_preference_scales_score(self):
+        listings = [
+            {'title': 'remote', 'description': 'Python', 'requirements': '', 'location': 'Remote'},
+            {'title': 'berlin', 'description': 'Python', 'requirements': '', 'location': 'Berlin, Germany'},
+        ]
+        recs = AIAnalyzer().recommend_jobs(['Python', 'Rust'], listings, {'location': 'Berlin'})
+        self.assertEqual(recs[0]['job']['title'], 'berlin')
+        self.assertAlmostEqual(recs[0]['match_score'], recs[1]['match_score'] * 1.2)
+        self.assertEqual(recs[0]['skill_match'], recs[1]['skill_match'])
+
+    def test_matched_skills_agree_with_score(self):
+        recs = self.recommend(
+            ['Java', 'Terraform', 'Google Cloud Platform'],
+            [('js', 'JavaScript frontend'), ('infra', 'Terraform on Google Cloud'), ('none', 'Sales role')],
+        )
+        for rec in recs.values():
+            self.assertEqual(bool(rec['matched_skills']), rec['skill_match'] > 0, rec['job']['title'])
+        self.assertEqual(recs['infra']['matched_skills'], ['Terraform', 'Google Cloud Platform'])
+        self.assertEqual(recs['js']['matched_skills'], [])
@@ -1,5 +1,8 @@
 from django.urls import path
-from .views import *
+from .views import (
+    signup, login_view, logout_view, profile_view, profile_edit, career_advice_view,
+    job_alerts, notifications_view, chatbot_view, chatbot_api, chatbot_stream_api,
+)
 from .api_views import get_notifications, mark_notification_read, mark_all_notifications_read
 
 urlpatterns = [
@@ -13,6 +16,7 @@ urlpatterns = [
     path('notifications/', notifications_view, name='notifications'),
     path('chatbot/', chatbot_view, name='chatbot'),
     path('api/chatbot/', chatbot_api, name='chatbot_api'),
+    path('api/chatbot/stream/', chatbot_stream_api, name='chatbot_stream_api'),
     
     # API endpoints
     path('api/notifications/', get_notifications, name='api_notifications'),
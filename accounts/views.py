@@ -1,9 +1,12 @@
+import re
 import time
 import json
 import logging
 from datetime import datetime
 from django.contrib.auth.models import User
-from django.http import HttpResponse, JsonResponse
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
@@ -31,8 +34,11 @@ except ImportError:
 from .forms import UserProfileForm, SignupForm
 from .models import *
 from .models import UserProfile
-from jobs.models import Job, JobCategory, Company
-from .advanced_chatbot import advanced_chatbot
+from jobs.models import Job, JobCategory, Company, ApplyForJob
+from .advanced_chatbot import get_chatbot
+from .ml import split_skills
+
+logger = logging.getLogger(__name__)
 
 # Handle AI analyzer imports gracefully
 try:
@@ -46,6 +52,11 @@ except ImportError:
     def resume_quality(text): return {"suggestions": [], "readability": {}}
     def check_ats_friendliness(text): return {"has_contact_info": False, "uses_standard_sections": False, "warnings": []}
 
+# Chatbot questions mentioning any of these get live job listings as context.
+# Substring matches, so 'job' also covers 'jobs' and 'opening' 'openings'.
+JOB_INTENT_KEYWORDS = ('job', 'opening', 'vacancy', 'vacancies', 'hiring', 'apply')
+JOB_INTENT_PATTERN = re.compile('|'.join(JOB_INTENT_KEYWORDS))
+
 
 def _extract_text_from_file(file_path):
     """Extract raw text from a PDF or DOCX file."""
@@ -68,6 +79,20 @@ def _extract_text_from_file(file_path):
     return text.strip()
 
 
+def _extract_resume_text(resume):
+    """Extract text from an uploaded resume, whichever storage holds it."""
+    try:
+        return _extract_text_from_file(resume.path)
+    except NotImplementedError:
+        # Remote storage (S3) has no local path: spool to a temp file first
+        suffix = os.path.splitext(resume.name)[1]
+        with tempfile.NamedTemporaryFile(suffix=suffix) as tmp, resume.open('rb') as fh:
+            for chunk in fh.chunks():
+                tmp.write(chunk)
+            tmp.flush()
+            return _extract_text_from_file(tmp.name)
+
+
 # Create your views here.
 def signup(request):
     form = SignupForm(request.POST or None)
@@ -108,20 +133,20 @@ def login_view(request):
         username = request.POST.get('username')
         password = request.POST.get('password')
 
-        if not User.objects.filter(username=username).exists():
-            messages.error(request, 'Username does not exist')
-            return redirect('login')
-
         user = authenticate(request, username=username, password=password)
         if user is not None:
             login(request, user)
-            temp = CustomUser.objects.get(user=user) if CustomUser.objects.filter(user=user).exists() else None
+            temp = CustomUser.objects.filter(user=user).first()
             if not temp or temp.role == 'applicant':
                 return redirect('dashboard')
             if temp.role == 'company':
-                if not temp.company:
+                if not temp.company_id:
                     return redirect("profile_completion")
                 return redirect("company_dashboard")
+        elif not User.objects.filter(username=username).exists():
+            # Only failed logins need to tell an unknown username apart
+            messages.error(request, 'Username does not exist')
+            return redirect('login')
         else:
             messages.error(request, 'Invalid username or password')
 
@@ -151,7 +176,7 @@ def profile_edit(request):
             if 'resume' in request.FILES:
                 try:
                     from .ai_enhanced import ai_analyzer
-                    resume_text = _extract_text_from_file(profile.resume.path)
+                    resume_text = _extract_resume_text(profile.resume)
                     
                     if resume_text:
                         # Extract skills using AI
@@ -162,7 +187,7 @@ def profile_edit(request):
                         
                         # Update profile with AI-extracted skills
                         if ai_skills:
-                            existing_skills = [skill.strip() for skill in (profile.skills or '').split(',') if skill.strip()]
+                            existing_skills = list(profile.skills_list)
                             all_skills = list(set(existing_skills + ai_skills))
                             profile.skills = ', '.join(all_skills)
                             profile.save()
@@ -216,7 +241,7 @@ def profile_view(request):
     # Convert skills string to list for better display
     skills_list = []
     if profile.skills:
-        skills_list = [skill.strip() for skill in profile.skills.split(',') if skill.strip()]
+        skills_list = list(profile.skills_list)
 
     context = {
         'profile': profile,
@@ -273,7 +298,7 @@ def career_advice_view(request):
             
             # Get AI analysis of resume
             try:
-                from .gemini_chatbot import gemini_chatbot
+                from .gemini_chatbot import get_gemini_chatbot
                 
                 resume_analysis_prompt = f"""
                 Analyze this resume and provide detailed feedback in JSON format ONLY:
@@ -303,7 +328,7 @@ def career_advice_view(request):
                     'db_context': ''
                 }
                 
-                response = gemini_chatbot.generate_response(resume_analysis_prompt, user_profile_dict)
+                response = get_gemini_chatbot().generate_response(resume_analysis_prompt, user_profile_dict)
                 print(f"Gemini response type: {response.get('type')}")
                 print(f"Gemini response confidence: {response.get('confidence')}")
                 print(f"Gemini response length: {len(response.get('response', ''))}")
@@ -372,7 +397,7 @@ def career_advice_view(request):
         
         # Get user skills
         if profile.skills:
-            user_skills = [skill.strip() for skill in profile.skills.split(',') if skill.strip()]
+            user_skills = list(profile.skills_list)
         
         # Calculate experience years (simplified)
         if profile.dateofbirth:
@@ -392,7 +417,7 @@ def career_advice_view(request):
         # Get AI-powered insights using Gemini
         if user_skills:
             try:
-                from .gemini_chatbot import gemini_chatbot
+                from .gemini_chatbot import get_gemini_chatbot
                 
                 # Create comprehensive prompt for career advice
                 career_prompt = f"""
@@ -432,7 +457,7 @@ def career_advice_view(request):
                     'db_context': ''
                 }
                 
-                response = gemini_chatbot.generate_response(career_prompt, user_profile_dict)
+                response = get_gemini_chatbot().generate_response(career_prompt, user_profile_dict)
                 print(f"Career advice response type: {response.get('type')}")
                 print(f"Career advice response confidence: {response.get('confidence')}")
                 if response.get('response'):
@@ -622,13 +647,13 @@ def chatbot_view(request):
         # Get resume text if available
         if profile.resume:
             try:
-                resume_text = _extract_text_from_file(profile.resume.path)
+                resume_text = _extract_resume_text(profile.resume)
                 user_profile_data['resume_text'] = resume_text[:1000]  # Limit text length
             except Exception as e:
                 print(f"Error extracting resume text: {e}")
         
         # Get suggested questions
-        suggested_questions = advanced_chatbot.get_suggested_questions(user_profile_data)
+        suggested_questions = get_chatbot().get_suggested_questions(user_profile_data)
         
         # Get pre-filled question from URL parameter
         initial_question = request.GET.get('q', '')
@@ -646,6 +671,96 @@ def chatbot_view(request):
     return render(request, 'accounts/chatbot.html', context)
 
 
+def _chatbot_context(request, question):
+    """Profile data and session history for a chatbot question, or None without a profile"""
+    # Get user profile data
+    try:
+        profile = request.user.userprofile
+        user_profile_data = {
+            'first_name': profile.first_name or '',
+            'last_name': profile.last_name or '',
+            'email': profile.email or '',
+            'phone': profile.phone or '',
+            'skills': profile.skills or '',
+            'experience': getattr(profile, 'experience', '') or '',
+            'education': getattr(profile, 'education', '') or '',
+            'resume_text': ''
+        }
+        # Field names only: the values are the user's personal details
+        logger.debug("Chatbot API: profile fields set: %s", [k for k, v in user_profile_data.items() if v])
+    except Exception as e:
+        logger.debug("Chatbot API: Error getting user profile: %s", e)
+        return None
+    
+    # Get resume text if available
+    if profile.resume:
+        try:
+            resume_text = _extract_resume_text(profile.resume)
+            user_profile_data['resume_text'] = resume_text[:1000]
+            logger.debug("Chatbot API: Resume text extracted: %d characters", len(resume_text))
+        except Exception as e:
+            logger.debug("Chatbot API: Error extracting resume text: %s", e)
+    
+    # Get conversation history from session
+    conversation_history = request.session.get('chatbot_history', [])
+    logger.debug("Chatbot API: Conversation history: %d entries", len(conversation_history))
+
+    # Optional: enrich context with live DB data for job intents
+    try:
+        q_lower = question.lower()
+        include_jobs = JOB_INTENT_PATTERN.search(q_lower) is not None
+        db_context_parts = []
+        if include_jobs:
+            # Simple relevance: filter by user skills appearing in job title or description
+            from jobs.models import Job
+            skill_terms = []
+            if user_profile_data.get('skills'):
+                if isinstance(user_profile_data['skills'], str):
+                    skill_terms = split_skills(user_profile_data['skills'])
+                else:
+                    skill_terms = user_profile_data['skills']
+            jobs_qs = Job.objects.filter(is_active=True).order_by('-created_at')[:50]
+            scored = []
+            for j in jobs_qs:
+                text = f"{j.title} {getattr(j, 'description', '')} {getattr(j.company, 'name', '')}".lower()
+                score = sum(1 for s in skill_terms if s and s.lower() in text)
+                scored.append((score, j))
+            top = [j for score, j in sorted(scored, key=lambda x: x[0], reverse=True)[:5]]
+            if not top:
+                top = list(jobs_qs[:5])
+            if top:
+                db_context_parts.append("Top jobs:")
+                for j in top:
+                    company_name = getattr(j.company, 'name', '') if getattr(j, 'company', None) else ''
+                    loc = getattr(j, 'location', '') if hasattr(j, 'location') else ''
+                    db_context_parts.append(f"- {j.title} | {company_name} | {loc}")
+        if db_context_parts:
+            user_profile_data['db_context'] = "\n".join(db_context_parts)
+    except Exception as e:
+        logger.debug("Chatbot API: DB enrichment skipped due to error: %s", e)
+    
+    return user_profile_data, conversation_history
+
+
+def _remember_chatbot_turn(request, conversation_history, question, response):
+    """Append a chatbot exchange to the session history and return its timestamp"""
+    # Store conversation in session
+    conversation_entry = {
+        'question': question,
+        'response': response['response'],
+        'timestamp': datetime.now().isoformat(),
+        'type': response.get('type', 'general')
+    }
+    conversation_history.append(conversation_entry)
+    
+    # Keep only last 10 conversations
+    if len(conversation_history) > 10:
+        conversation_history = conversation_history[-10:]
+    
+    request.session['chatbot_history'] = conversation_history
+    return conversation_entry['timestamp']
+
+
 @login_required
 def chatbot_api(request):
     """API endpoint for chatbot interactions"""
@@ -661,78 +776,16 @@ def chatbot_api(request):
         
         print(f"Chatbot API: Received question: {question}")
         
-        # Get user profile data
-        try:
-            profile = request.user.userprofile
-            user_profile_data = {
-                'first_name': profile.first_name or '',
-                'last_name': profile.last_name or '',
-                'email': profile.email or '',
-                'phone': profile.phone or '',
-                'skills': profile.skills or '',
-                'experience': getattr(profile, 'experience', '') or '',
-                'education': getattr(profile, 'education', '') or '',
-                'resume_text': ''
-            }
-            print(f"Chatbot API: User profile data: {user_profile_data}")
-        except Exception as e:
-            print(f"Chatbot API: Error getting user profile: {e}")
+        context = _chatbot_context(request, question)
+        if context is None:
             return JsonResponse({'error': 'User profile not found'}, status=400)
-        
-        # Get resume text if available
-        if profile.resume:
-            try:
-                resume_text = _extract_text_from_file(profile.resume.path)
-                user_profile_data['resume_text'] = resume_text[:1000]
-                print(f"Chatbot API: Resume text extracted: {len(resume_text)} characters")
-            except Exception as e:
-                print(f"Chatbot API: Error extracting resume text: {e}")
-        
-        # Get conversation history from session
-        conversation_history = request.session.get('chatbot_history', [])
-        print(f"Chatbot API: Conversation history: {len(conversation_history)} entries")
-
-        # Optional: enrich context with live DB data for job intents
-        try:
-            q_lower = question.lower()
-            include_jobs = any(k in q_lower for k in [
-                'job', 'jobs', 'opening', 'openings', 'vacancy', 'vacancies', 'hiring', 'apply'
-            ])
-            db_context_parts = []
-            if include_jobs:
-                # Simple relevance: filter by user skills appearing in job title or description
-                from jobs.models import Job
-                skill_terms = []
-                if user_profile_data.get('skills'):
-                    if isinstance(user_profile_data['skills'], str):
-                        skill_terms = [s.strip() for s in user_profile_data['skills'].split(',') if s.strip()]
-                    else:
-                        skill_terms = user_profile_data['skills']
-                jobs_qs = Job.objects.filter(is_active=True).order_by('-created_at')[:50]
-                scored = []
-                for j in jobs_qs:
-                    text = f"{j.title} {getattr(j, 'description', '')} {getattr(j.company, 'name', '')}".lower()
-                    score = sum(1 for s in skill_terms if s and s.lower() in text)
-                    scored.append((score, j))
-                top = [j for score, j in sorted(scored, key=lambda x: x[0], reverse=True)[:5]]
-                if not top:
-                    top = list(jobs_qs[:5])
-                if top:
-                    db_context_parts.append("Top jobs:")
-                    for j in top:
-                        company_name = getattr(j.company, 'name', '') if getattr(j, 'company', None) else ''
-                        loc = getattr(j, 'location', '') if hasattr(j, 'location') else ''
-                        db_context_parts.append(f"- {j.title} | {company_name} | {loc}")
-            if db_context_parts:
-                user_profile_data['db_context'] = "\n".join(db_context_parts)
-        except Exception as e:
-            print(f"Chatbot API: DB enrichment skipped due to error: {e}")
+        user_profile_data, conversation_history = context
         
         # Generate AI response
         try:
             print("Chatbot API: Generating AI response...")
             print("Chatbot API: Using Gemini-only chatbot...")
-            response = advanced_chatbot.generate_response(question, user_profile_data, conversation_history)
+            response = get_chatbot().generate_response(question, user_profile_data, conversation_history)
             print(f"Chatbot API: AI response generated: {response}")
         except Exception as e:
             print(f"Chatbot API: Error generating AI response: {e}")
@@ -743,26 +796,13 @@ def chatbot_api(request):
                 'type': 'general'
             }
         
-        # Store conversation in session
-        conversation_entry = {
-            'question': question,
-            'response': response['response'],
-            'timestamp': datetime.now().isoformat(),
-            'type': response.get('type', 'general')
-        }
-        conversation_history.append(conversation_entry)
-        
-        # Keep only last 10 conversations
-        if len(conversation_history) > 10:
-            conversation_history = conversation_history[-10:]
-        
-        request.session['chatbot_history'] = conversation_history
+        timestamp = _remember_chatbot_turn(request, conversation_history, question, response)
         
         return JsonResponse({
             'response': response['response'],
             'confidence': response.get('confidence', 0.5),
             'type': response.get('type', 'general'),
-            'timestamp': conversation_entry['timestamp']
+            'timestamp': timestamp
         })
         
     except json.JSONDecodeError as e:
@@ -775,6 +815,55 @@ def chatbot_api(request):
         return JsonResponse({'error': f'Internal server error: {str(e)}'}, status=500)
 
 
+@login_required
+def chatbot_stream_api(request):
+    """Chatbot endpoint that streams the answer as Server-Sent Events: one
+    {"delta": ...} event per chunk, then a final event shaped like chatbot_api's
+    JSON response with "done": true"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    question = data.get('question', '').strip()
+    if not question:
+        return JsonResponse({'error': 'Question is required'}, status=400)
+    
+    context = _chatbot_context(request, question)
+    if context is None:
+        return JsonResponse({'error': 'User profile not found'}, status=400)
+    user_profile_data, conversation_history = context
+    
+    def events():
+        stream = get_chatbot().stream_response(question, user_profile_data, conversation_history)
+        while True:
+            try:
+                chunk = next(stream)
+            except StopIteration as finished:
+                response = finished.value
+                break
+            yield f"data: {json.dumps({'delta': chunk})}\n\n"
+        
+        timestamp = _remember_chatbot_turn(request, conversation_history, question, response)
+        # SessionMiddleware has already run by the time the body streams
+        request.session.save()
+        yield "data: " + json.dumps({
+            'done': True,
+            'response': response['response'],
+            'confidence': response.get('confidence', 0.5),
+            'type': response.get('type', 'general'),
+            'timestamp': timestamp
+        }) + "\n\n"
+    
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop Nginx from buffering the stream (see deploy/nginx.conf)
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @login_required
 def job_alerts(request):
     """Manage job alerts"""
@@ -823,4 +912,41 @@ def job_alerts(request):
             except JobAlert.DoesNotExist:
                 messages.error(request, 'Job alert not found.')
     
-    return render(request, 'accounts/job_alerts.html', {'alerts': alerts})
\ No newline at end of file
+    return render(request, 'accounts/job_alerts.html', {'alerts': alerts})
+
+def _can_view_resume(user, profile):
+    """The owner, staff and companies the owner has applied to may see a resume"""
+    if not user.is_authenticated:
+        return False
+    if user.pk == profile.user_id or user.is_staff:
+        return True
+    company_id = CustomUser.objects.filter(user=user).values_list('company_id', flat=True).first()
+    return bool(company_id) and ApplyForJob.objects.filter(user_id=profile.user_id, job__company_id=company_id).exists()
+
+
+def user_media(request, user_id, filename):
+    """Serve a user's upload from MEDIA_ROOT: the profile picture to anyone,
+    the resume only to those _can_view_resume allows"""
+    profile = get_object_or_404(UserProfile, user_id=user_id)
+    name = f'user_{user_id}/{filename}'
+    if profile.resume and name == profile.resume.name:
+        if not _can_view_resume(request.user, profile):
+            raise Http404
+        cache_control = 'private, no-store'
+    elif profile.profile_picture and name == profile.profile_picture.name:
+        cache_control = 'public, max-age=604800'
+    else:
+        raise Http404
+    
+    if settings.MEDIA_ACCEL_REDIRECT:
+        # Nginx sends the file from its internal location (deploy/nginx.conf)
+        response = HttpResponse()
+        del response['Content-Type']
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT + name
+    else:
+        try:
+            response = FileResponse(default_storage.open(name))
+        except FileNotFoundError:
+            raise Http404
+    response['Cache-Control'] = cache_control
+    return response
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import *
+from .views import user_bookmarks, toggle_bookmark
 
 urlpatterns = [
     path('my_bookmarks/', user_bookmarks, name='user_bookmarks'),
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-16 07:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_applyforjob_ai_match_score'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='job_active_recent_idx'),
+        ),
+    ]
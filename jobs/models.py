@@ -100,6 +100,10 @@ class Job(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        # Listings, recommendations and job alerts read the newest active jobs
+        indexes = [
+            models.Index(fields=['-created_at'], condition=models.Q(is_active=True), name='job_active_recent_idx'),
+        ]
 
 
 class ApplyForJob(models.Model):
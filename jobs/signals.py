@@ -1,9 +1,11 @@
+from django.db import transaction
 from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver
 from django.utils.text import slugify
 from django.db.models import Q
 from django.contrib.auth.models import User
 from .models import Job
+from accounts.ml import split_skills
 from accounts.models import JobAlert, Notification, UserProfile
 
 
@@ -33,6 +35,13 @@ def send_job_alerts_on_creation(sender, instance, created, **kwargs):
         return
     
     try:
+        # Computed once for all alerts and users rather than per match
+        job_fields = (instance.title.lower(), instance.description.lower(), instance.requirements.lower())
+        job_location = instance.location.lower()
+        company_name = instance.company.name
+        job_link = instance.get_absolute_url()
+        notifications = []
+        
         # Get all active job alerts
         job_alerts = JobAlert.objects.filter(is_active=True)
         
@@ -42,16 +51,11 @@ def send_job_alerts_on_creation(sender, instance, created, **kwargs):
             
             # Check keywords match
             if alert.keywords:
-                keywords = [kw.strip().lower() for kw in alert.keywords.split(',') if kw.strip()]
-                for keyword in keywords:
-                    if (keyword in instance.title.lower() or 
-                        keyword in instance.description.lower() or 
-                        keyword in instance.requirements.lower()):
-                        matches = True
-                        break
+                keywords = [kw.lower() for kw in split_skills(alert.keywords)]
+                matches = any(keyword in field for keyword in keywords for field in job_fields)
             
             # Check location match
-            if alert.location and alert.location.lower() in instance.location.lower():
+            if alert.location and alert.location.lower() in job_location:
                 matches = True
             
             # Check salary range match
@@ -62,18 +66,18 @@ def send_job_alerts_on_creation(sender, instance, created, **kwargs):
             
             if matches:
                 # Create notification for the user
-                Notification.objects.create(
-                    user=alert.user,
+                notifications.append(Notification(
+                    user_id=alert.user_id,
                     title=f"New Job Alert: {instance.title}",
-                    message=f"A new job at {instance.company.name} matches your alert criteria!",
-                    link=instance.get_absolute_url()
-                )
+                    message=f"A new job at {company_name} matches your alert criteria!",
+                    link=job_link
+                ))
         
         # Also send alerts based on user skills (similar to management command)
         users_with_skills = User.objects.filter(
             userprofile__skills__isnull=False,
             userprofile__skills__gt=''
-        ).select_related('userprofile')
+        ).select_related('userprofile').only('id', 'username', 'userprofile__skills')
         
         for user in users_with_skills:
             try:
@@ -82,32 +86,27 @@ def send_job_alerts_on_creation(sender, instance, created, **kwargs):
                     continue
                 
                 # Get user's skills
-                user_skills = [skill.strip().lower() for skill in profile.skills.split(',') if skill.strip()]
+                user_skills = [skill.lower() for skill in split_skills(profile.skills)]
                 
                 if not user_skills:
                     continue
                 
-                # Check if job matches user skills
-                skill_match = False
-                for skill in user_skills[:3]:  # Check first 3 skills
-                    if (skill in instance.title.lower() or 
-                        skill in instance.description.lower() or 
-                        skill in instance.requirements.lower()):
-                        skill_match = True
-                        break
-                
-                if skill_match:
+                # Check if job matches user skills (first 3 skills)
+                if any(skill in field for skill in user_skills[:3] for field in job_fields):
                     # Create notification
-                    Notification.objects.create(
+                    notifications.append(Notification(
                         user=user,
                         title=f"New Job Matches Your Skills!",
-                        message=f"Check out this new {instance.title} position at {instance.company.name}",
-                        link=instance.get_absolute_url()
-                    )
+                        message=f"Check out this new {instance.title} position at {company_name}",
+                        link=job_link
+                    ))
                     
             except Exception as e:
                 # Log error but don't break the job creation
                 print(f"Error sending skill-based alert to {user.username}: {str(e)}")
+        
+        with transaction.atomic():
+            Notification.objects.bulk_create(notifications, batch_size=500)
                 
     except Exception as e:
         # Log error but don't break the job creation
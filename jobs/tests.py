@@ -1,3 +1,120 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import JobAlert, Notification, UserProfile
+from .models import Company, Job, JobCategory
+
+
+def create_job(title, description='', requirements='', **fields):
+    company, _ = Company.objects.get_or_create(name='Acme', defaults={'description': 'Widgets', 'location': 'Remote'})
+    category, _ = JobCategory.objects.get_or_create(name='Engineering', slug='engineering')
+    return Job.objects.create(
+        title=title, slug=title.lower().replace(' ', '-'), company=company, category=category,
+        description=description, requirements=requirements, responsibilities='Ship features',
+        employment_type='full_time', experience_level='mid', location=fields.pop('location', 'Remote'),
+        **fields
+    )
+
+
+def create_user(username, skills=''):
+    user = User.objects.create_user(username, password='pass12345')
+    UserProfile.objects.create(user=user, skills=skills)
+    return user
+
+
+class CacheForAnonymousTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_anonymous_home_page_is_served_from_cache(self):
+        first = self.client.get(reverse('home'))
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('public', first['Cache-Control'])
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('home'))
+        self.assertEqual(second.content, first.content)
+
+    def test_anonymous_job_detail_is_cookie_free_and_cached(self):
+        url = create_job('Django Developer').get_absolute_url()
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertFalse(first.cookies)
+        self.assertIn('public', first['Cache-Control'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).content, first.content)
+
+    def test_responses_setting_cookies_are_not_public(self):
+        from .views import cache_for_anonymous
+
+        @cache_for_anonymous(60)
+        def view(request):
+            response = HttpResponse('ok')
+            response.set_cookie('csrftoken', 'token')
+            return response
+
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        request._messages = CookieStorage(request)
+        self.assertNotIn('public', view(request).get('Cache-Control', ''))
+
+    def test_signed_in_users_get_a_fresh_render(self):
+        self.client.get(reverse('home'))
+        self.client.force_login(User.objects.create_user('seeker', password='pass12345'))
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('public', response.get('Cache-Control', ''))
+
+
+class JobAlertSignalTests(TestCase):
+    def test_new_job_notifies_matching_alerts_and_skills(self):
+        keyword_user = create_user('keywords')
+        JobAlert.objects.create(user=keyword_user, keywords='Rust, Django')
+        location_user = create_user('berlin')
+        JobAlert.objects.create(user=location_user, keywords='Cobol', location='Berlin')
+        create_user('skills', skills='Python, SQL')
+        create_user('unmatched', skills='Photoshop')
+
+        job = create_job('Django Developer', description='Build APIs in Python')
+
+        notified = dict(Notification.objects.values_list('user__username', 'title'))
+        self.assertEqual(notified, {
+            'keywords': 'New Job Alert: Django Developer',
+            'skills': 'New Job Matches Your Skills!',
+        })
+        self.assertTrue(all(link == job.get_absolute_url() for link in Notification.objects.values_list('link', flat=True)))
+
+    def test_inactive_job_sends_nothing(self):
+        create_user('skills', skills='Python')
+        create_job('Python Developer', is_active=False)
+        self.assertFalse(Notification.objects.exists())
+
+
+class SendJobAlertsCommandTests(TestCase):
+    def test_notifies_users_whose_first_three_skills_all_match(self):
+        create_user('seeker', skills='Python, Django, AWS, Go')
+        create_user('designer', skills='Photoshop')
+        create_job('Django Developer', description='Python services', requirements='AWS experience')
+        create_job('Python Scripter', description='Automation in Python')
+        old = create_job('Django Lead', description='Python on AWS')
+        Job.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=2))
+        # Leave only what the command itself creates
+        Notification.objects.all().delete()
+
+        out = StringIO()
+        call_command('send_job_alerts', stdout=out)
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.user.username, 'seeker')
+        self.assertEqual(notification.title, '🎯 1 New Job Match Your Skills!')
+        self.assertIn('python, django, aws', notification.message)
+        self.assertIn('Successfully sent 1 job alerts for 1 new jobs', out.getvalue())
@@ -1,5 +1,10 @@
 from django.urls import path
-from .views import *
+from .views import (
+    job_list, find_jobs, my_applications, job_detail, apply_job, dashboard,
+    company_dashboard, create_company, update_company, profile_completion, create_job,
+    company_applicants, company_applicant_detail, update_application_status,
+    ai_job_suggestions, ai_candidate_analysis, ai_interview_scheduler, ai_generate_job_posting,
+)
 from accounts.views import company_view
 
 urlpatterns = [
@@ -4,10 +4,12 @@ from django.db.models import Q, Count
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.contrib.auth import logout
 from django.core.exceptions import PermissionDenied
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_cookie
+from django.utils.cache import patch_cache_control
 from django.conf import settings
 from functools import wraps
 import os
@@ -44,7 +46,29 @@ def applicant_required(view_func):
     return wrapper
 
 
+def cache_for_anonymous(timeout):
+    """Decorator to serve anonymous GETs of a public page from the cache"""
+    def decorator(view_func):
+        cached_view = cache_page(timeout)(vary_on_cookie(view_func))
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            # Signed-in users and pending flash messages get a fresh render
+            if (request.user.is_authenticated or request.method != 'GET'
+                    or len(messages.get_messages(request))):
+                return view_func(request, *args, **kwargs)
+            response = cached_view(request, *args, **kwargs)
+            # A response setting cookies (e.g. a CSRF token) is per visitor
+            # and must never be held by a shared cache
+            if not response.cookies:
+                patch_cache_control(response, public=True, s_maxage=timeout, stale_while_revalidate=timeout * 5)
+            return response
+        return wrapper
+    return decorator
+
+
 # Create your views here.
+@cache_for_anonymous(60)
 def job_list(request):
     jobs = Job.objects.filter(is_active=True).select_related('company', 'category')
 
@@ -282,8 +306,7 @@ def my_applications(request):
     if request.user.is_authenticated:
         try:
             from accounts.models import ResumeAnalysis
-            from accounts.ml import compute_resume_keywords, score_job_match
-            from accounts.ml_tf import HAS_TF, score_job_match_tf
+            from accounts.ml import compute_resume_keywords, score_text_match
             from accounts.ai_analyzer import calculate_skill_match_score, extract_key_phrases
             
             analysis = getattr(request.user, 'resume_analysis', None)
@@ -291,6 +314,7 @@ def my_applications(request):
             user_skills, resume_vec = compute_resume_keywords(skills_src, '')
             
             if user_skills:
+                resume_text = ' '.join(user_skills)
                 for job in page_obj:
                     # Combine job text for analysis
                     job_text = f"{job.title} {job.description} {job.requirements} {job.responsibilities}"
@@ -300,11 +324,7 @@ def my_applications(request):
                     
                     # 1. Vector similarity (if available)
                     if resume_vec:
-                        if HAS_TF:
-                            resume_text = ' '.join(user_skills)
-                            vec_score = score_job_match_tf(resume_text, job_text)
-                        else:
-                            vec_score = score_job_match(resume_vec, job_text)
+                        vec_score = score_text_match(resume_text, job_text)
                         scores.append(vec_score)
                     
                     # 2. Skill-based matching
@@ -322,7 +342,7 @@ def my_applications(request):
                     experience_bonus = 0
                     if hasattr(request.user, 'userprofile') and request.user.userprofile.skills:
                         # Simple heuristic: more skills = more experience
-                        skill_count = len([s for s in request.user.userprofile.skills.split(',') if s.strip()])
+                        skill_count = len(request.user.userprofile.skills_list)
                         if skill_count >= 5 and 'senior' in job_text.lower():
                             experience_bonus = 15
                         elif skill_count >= 3 and 'mid' in job_text.lower():
@@ -372,6 +392,7 @@ def my_applications(request):
     return render(request, 'landing.html', context)
 
 
+@cache_for_anonymous(60)
 def job_detail(request, slug):
     # Handle slugs that might have been URL encoded
     try:
@@ -650,7 +671,7 @@ def company_dashboard(request):
     ai_insights = {}
     if company:
         try:
-            from accounts.gemini_chatbot import gemini_chatbot
+            from accounts.gemini_chatbot import get_gemini_chatbot
             
             # Create company profile for AI analysis
             company_profile = {
@@ -695,7 +716,7 @@ def company_dashboard(request):
             Do not include any text before or after the JSON. Only return the JSON object.
             """
             
-            response = gemini_chatbot.generate_response(company_insights_prompt, company_profile)
+            response = get_gemini_chatbot().generate_response(company_insights_prompt, company_profile)
             
             if response and response.get('response'):
                 try:
@@ -819,7 +840,7 @@ def dashboard(request):
     # Skills hub suggestion (very simple heuristic)
     suggested_skill = None
     try:
-        user_skills = [s.strip().lower() for s in (profile.skills or '').split(',') if s.strip()]
+        user_skills = profile.skills_lower
         corpus = ' '.join((job.description + ' ' + job.requirements) for job in recent_jobs).lower()
         for s in ['graphql', 'kubernetes', 'aws', 'react', 'django', 'spring boot']:
             if s in corpus and s not in user_skills:
@@ -851,7 +872,7 @@ def dashboard(request):
     ai_recommendations = []
     try:
         from accounts.ai_enhanced import ai_analyzer
-        user_skills = [skill.strip() for skill in (profile.skills or '').split(',') if skill.strip()]
+        user_skills = list(profile.skills_list)
         
         if user_skills:
             # Get all active jobs for recommendation
@@ -893,10 +914,6 @@ def dashboard(request):
     }
     return render(request, 'accounts/dashboard.html', context)
 
-def logout_view(request):
-    # Duplicate of accounts.logout_view; remove this to avoid conflicts
-    return redirect('home')
-
 
 @login_required
 @company_required
@@ -1010,7 +1027,7 @@ def company_applicant_detail(request, application_id: int):
 
     skills = []
     if profile and profile.skills:
-        skills = [skill.strip() for skill in profile.skills.split(',') if skill.strip()]
+        skills = list(profile.skills_list)
 
     # Use stored AI match score
     match_score = application.ai_match_score
@@ -1053,7 +1070,7 @@ def company_applicant_detail(request, application_id: int):
 def generate_comprehensive_ai_analysis(application, profile):
     """Generate comprehensive AI analysis for candidate detail page"""
     try:
-        from accounts.gemini_chatbot import gemini_chatbot
+        from accounts.gemini_chatbot import get_gemini_chatbot
         
         # Create context for AI analysis
         candidate_context = {
@@ -1097,7 +1114,7 @@ def generate_comprehensive_ai_analysis(application, profile):
         Do not include any text before or after the JSON. Only return the JSON object.
         """
         
-        response = gemini_chatbot.generate_response(analysis_prompt, candidate_context)
+        response = get_gemini_chatbot().generate_response(analysis_prompt, candidate_context)
         
         if response and response.get('response'):
             # Clean the response
@@ -1126,7 +1143,7 @@ def generate_comprehensive_ai_analysis(application, profile):
 def generate_fallback_analysis(application, profile):
     """Fallback analysis when AI is unavailable"""
     job_text = f"{application.job.description} {application.job.requirements}".lower()
-    user_skills = [s.strip().lower() for s in profile.skills.split(',') if s.strip()] if profile.skills else []
+    user_skills = profile.skills_lower
     
     # Calculate missing skills
     common_skills = ['python', 'javascript', 'react', 'django', 'aws', 'kubernetes', 'docker', 'sql', 'git']
@@ -1177,7 +1194,7 @@ def generate_fallback_analysis(application, profile):
 def calculate_ai_match_score(application, profile):
     """Calculate comprehensive AI match score for a candidate"""
     try:
-        from accounts.gemini_chatbot import gemini_chatbot
+        from accounts.gemini_chatbot import get_gemini_chatbot
         
         # Create context for AI analysis
         candidate_context = {
@@ -1214,7 +1231,7 @@ def calculate_ai_match_score(application, profile):
         Do not include any text before or after the JSON. Only return the JSON object.
         """
         
-        response = gemini_chatbot.generate_response(scoring_prompt, candidate_context)
+        response = get_gemini_chatbot().generate_response(scoring_prompt, candidate_context)
         
         if response and response.get('response'):
             # Clean the response
@@ -1247,7 +1264,7 @@ def calculate_fallback_match_score(application, profile):
     # Skills matching (40% weight)
     if profile.skills:
         job_text = f"{application.job.description} {application.job.requirements}".lower()
-        user_skills = [s.strip().lower() for s in profile.skills.split(',') if s.strip()]
+        user_skills = profile.skills_lower
         skill_matches = sum(1 for skill in user_skills if skill in job_text)
         skills_score = min(40, skill_matches * 8)
         score += skills_score
@@ -1264,7 +1281,7 @@ def calculate_fallback_match_score(application, profile):
     
     # Experience level bonus (20% weight)
     if profile.skills:
-        skill_count = len([s for s in profile.skills.split(',') if s.strip()])
+        skill_count = len(profile.skills_list)
         if skill_count >= 5:
             score += 20
         elif skill_count >= 3:
@@ -1280,7 +1297,7 @@ def calculate_skills_match(job, profile):
         return 0
     
     job_text = f"{job.description} {job.requirements}".lower()
-    user_skills = [s.strip().lower() for s in profile.skills.split(',') if s.strip()]
+    user_skills = profile.skills_lower
     
     if not user_skills:
         return 0
@@ -1293,7 +1310,7 @@ def calculate_experience_level(profile):
     if not profile.skills:
         return 'Entry Level'
     
-    skill_count = len([s for s in profile.skills.split(',') if s.strip()])
+    skill_count = len(profile.skills_list)
     
     if skill_count >= 8:
         return 'Senior Level'
@@ -1331,7 +1348,7 @@ def ai_generate_job_posting(request):
         if not company:
             return JsonResponse({'success': False, 'error': 'Company profile not found'})
         
-        from accounts.gemini_chatbot import gemini_chatbot
+        from accounts.gemini_chatbot import get_gemini_chatbot
         
         # Create context for AI job generation
         ai_context = {
@@ -1380,7 +1397,7 @@ def ai_generate_job_posting(request):
         Do not include any text before or after the JSON. Only return the JSON object.
         """
         
-        response = gemini_chatbot.generate_response(job_generation_prompt, ai_context)
+        response = get_gemini_chatbot().generate_response(job_generation_prompt, ai_context)
         
         if response and response.get('response'):
             # Clean the response
@@ -1442,7 +1459,7 @@ def ai_job_suggestions(request):
         industry = data.get('industry', '')
         location = data.get('location', '')
         
-        from accounts.gemini_chatbot import gemini_chatbot
+        from accounts.gemini_chatbot import get_gemini_chatbot
         
         # Create context for AI analysis
         job_context = {
@@ -1480,7 +1497,7 @@ def ai_job_suggestions(request):
         Do not include any text before or after the JSON. Only return the JSON object.
         """
         
-        response = gemini_chatbot.generate_response(suggestions_prompt, job_context)
+        response = get_gemini_chatbot().generate_response(suggestions_prompt, job_context)
         
         if response and response.get('response'):
             # Clean the response
@@ -1538,7 +1555,7 @@ def ai_candidate_analysis(request):
         application = get_object_or_404(ApplyForJob, id=application_id)
         profile = get_object_or_404(UserProfile, user=application.user)
         
-        from accounts.gemini_chatbot import gemini_chatbot
+        from accounts.gemini_chatbot import get_gemini_chatbot
         
         # Create candidate context
         candidate_context = {
@@ -1583,7 +1600,7 @@ def ai_candidate_analysis(request):
         Do not include any text before or after the JSON. Only return the JSON object.
         """
         
-        response = gemini_chatbot.generate_response(analysis_prompt, candidate_context)
+        response = get_gemini_chatbot().generate_response(analysis_prompt, candidate_context)
         
         if response and response.get('response'):
             # Clean the response
@@ -1641,7 +1658,7 @@ def ai_interview_scheduler(request):
         
         application = get_object_or_404(ApplyForJob, id=application_id)
         
-        from accounts.gemini_chatbot import gemini_chatbot
+        from accounts.gemini_chatbot import get_gemini_chatbot
         
         # Create scheduling context
         scheduling_context = {
@@ -1679,7 +1696,7 @@ def ai_interview_scheduler(request):
         Do not include any text before or after the JSON. Only return the JSON object.
         """
         
-        response = gemini_chatbot.generate_response(scheduling_prompt, scheduling_context)
+        response = get_gemini_chatbot().generate_response(scheduling_prompt, scheduling_context)
         
         if response and response.get('response'):
             # Clean the response
@@ -7,7 +7,7 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'JobSite.settings')
 django.setup()
 
-from accounts.gemini_chatbot import gemini_chatbot
+from accounts.gemini_chatbot import get_gemini_chatbot
 
 print('Testing Gemini Chatbot directly...')
 
@@ -20,7 +20,7 @@ try:
         'db_context': ''
     }
     
-    response = gemini_chatbot.generate_response("Hello, can you help me?", test_context)
+    response = get_gemini_chatbot().generate_response("Hello, can you help me?", test_context)
     print('Gemini response:', response)
     
     if response and response.get('response'):